@@ -10,7 +10,13 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_asgi_application()
+
+# Django imports the URLconf, and with it DRF and the views, on the first
+# request. Do it now so a preforking server loads them once before forking
+# and the workers share those pages.
+get_resolver().url_patterns
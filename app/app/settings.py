@@ -52,6 +52,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
+    'core.middleware.GZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,6 +64,32 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Record per-request query counts, SQL time and view time.
+QUERY_INSTRUMENTATION = bool(int(os.environ.get('QUERY_INSTRUMENTATION', 0)))
+# Warn when the same query shape runs more than this many times per request.
+QUERY_INSTRUMENTATION_REPEAT_THRESHOLD = int(
+    os.environ.get('QUERY_INSTRUMENTATION_REPEAT_THRESHOLD', 5)
+)
+
+# The proxy compresses responses. Enable GZIP_RESPONSES to compress them in
+# Django instead, e.g. when the app is served without the proxy.
+GZIP_RESPONSES = bool(int(os.environ.get('GZIP_RESPONSES', 0)))
+GZIP_MIN_LENGTH = int(os.environ.get('GZIP_MIN_LENGTH', 1024))
+
+# Collect Prometheus metrics served at /api/metrics.
+METRICS_ENABLED = bool(int(os.environ.get('METRICS_ENABLED', 1)))
+
+# Seconds each dependency check of the readiness probe may take, and how
+# long a worker reuses its last result.
+HEALTH_CHECK_TIMEOUT = float(os.environ.get('HEALTH_CHECK_TIMEOUT', 1))
+HEALTH_CHECK_CACHE_SECONDS = float(
+    os.environ.get('HEALTH_CHECK_CACHE_SECONDS', 5)
+)
+
+# Serve the recipe, tag and ingredient lists from async views. Only useful
+# when running under ASGI (SERVER_MODE=asgi in scripts/run.sh).
+ASYNC_VIEWS = bool(int(os.environ.get('ASYNC_VIEWS', 0)))
+
 ROOT_URLCONF = 'app.urls'
 
 TEMPLATES = [
@@ -95,6 +124,83 @@ DATABASES = {
     }
 }
 
+# Read replicas share the primary's credentials and only differ by host.
+DATABASE_REPLICAS = []
+for index, host in enumerate(
+    filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))
+):
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# Seconds a user's reads stay on the primary after they write.
+DB_REPLICA_STICKY_SECONDS = int(
+    os.environ.get('DB_REPLICA_STICKY_SECONDS', 5)
+)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+# 'redis' is shared by every worker and host, 'file' shares entries between
+# the workers of a single host (/dev/shm keeps them in memory) and 'locmem'
+# is private to each worker process.
+CACHE_BACKENDS = {
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+# Compose passes unset variables as empty strings, so those fall back to
+# the defaults too.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND') or 'locmem'
+CACHE_DEFAULT_LOCATIONS = {
+    'redis': 'redis://redis:6379/0',
+    'file': '/dev/shm/recipe-app-cache',
+    'locmem': 'recipe-app',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': (
+            os.environ.get('CACHE_LOCATION') or
+            CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND]
+        ),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT') or 300),
+        # Bump CACHE_VERSION on deploy to orphan entries of the last release.
+        'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX') or 'recipe-app',
+        'VERSION': int(os.environ.get('CACHE_VERSION') or 1),
+    }
+}
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/4.0/topics/auth/passwords/
+
+# Hashes made by any of the later hashers are upgraded to Argon2 on login.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
+AUTHENTICATION_BACKENDS = ['user.backends.OffloadedHashingBackend']
+
+# Processes hashing passwords per uWSGI worker; 0 hashes in the request
+# thread.
+PASSWORD_HASHING_WORKERS = int(os.environ.get('PASSWORD_HASHING_WORKERS', 1))
+# Hashing calls allowed to wait for a free process before answering 429.
+PASSWORD_HASHING_QUEUE = int(os.environ.get('PASSWORD_HASHING_QUEUE', 4))
+PASSWORD_HASHING_RETRY_AFTER = int(
+    os.environ.get('PASSWORD_HASHING_RETRY_AFTER', 1)
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -135,7 +241,9 @@ USE_TZ = True
 STATIC_URL = '/static/static/'
 MEDIA_URL = '/static/media/'
 
-STATIC_ROOT = '/vol/web/static'
+STATIC_ROOT = os.environ.get('STATIC_ROOT', '/vol/web/static')
+# Collected files get a content hash in their name and compressed copies.
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
 MEDIA_ROOT = '/vol/web/media'
 
 # Default primary key field type
@@ -145,10 +253,53 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+# Seconds an API token stays valid after it was issued or last renewed.
+AUTH_TOKEN_TTL = int(os.environ.get('AUTH_TOKEN_TTL', 7 * 24 * 60 * 60))
+# Tokens in use are renewed at most once per interval to limit writes.
+AUTH_TOKEN_RENEW_INTERVAL = int(
+    os.environ.get('AUTH_TOKEN_RENEW_INTERVAL', 60 * 60)
+)
+# Tokens kept per user. Logging in again deletes the oldest beyond this.
+AUTH_TOKENS_PER_USER = int(os.environ.get('AUTH_TOKENS_PER_USER') or 10)
+# Issue signed access tokens that are verified without a lookup. The API
+# token then acts as the refresh token.
+SIGNED_ACCESS_TOKENS = bool(int(os.environ.get('SIGNED_ACCESS_TOKENS', 0)))
+# Seconds a signed access token stays valid. Revoked and deleted users keep
+# read access for at most this long; writes are refused straight away.
+SIGNED_ACCESS_TOKEN_TTL = int(
+    os.environ.get('SIGNED_ACCESS_TOKEN_TTL', 5 * 60)
+)
+
 REST_FRAMEWORK = {
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema'
+    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # nginx passes the client address as REMOTE_ADDR; raise this when more
+    # proxies append to X-Forwarded-For.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 0)),
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.environ.get('THROTTLE_LOGIN_IP', '30/min'),
+        'login_email': os.environ.get('THROTTLE_LOGIN_EMAIL', '10/min'),
+        'user_create_ip': os.environ.get('THROTTLE_USER_CREATE_IP', '20/hour'),
+        'user_create_email': os.environ.get(
+            'THROTTLE_USER_CREATE_EMAIL', '5/hour'),
+    },
 }
 
 SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core': {
+            'handlers': ['console'],
+            'level': os.environ.get('APP_LOG_LEVEL', 'INFO'),
+        },
+    },
 }
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Django settings for running the test suite.
+
+    python manage.py test --settings=app.settings_test --parallel
+"""
+from app.settings import *  # noqa: F401,F403
+from app.settings import DATABASES, os
+
+# Hashing with the production hashers dominates test time, so use MD5 and
+# hash in the request thread.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+PASSWORD_HASHING_WORKERS = 0
+
+DATABASES['default']['TEST'] = {
+    # Create the tables straight from the models instead of replaying
+    # every migration.
+    'MIGRATE': False,
+}
+
+# Clone the test database from a template built by build_test_template.
+if os.environ.get('DB_TEST_TEMPLATE'):
+    DATABASES['default']['TEST']['TEMPLATE'] = os.environ['DB_TEST_TEMPLATE']
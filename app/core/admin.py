@@ -4,11 +4,56 @@ Django admin customization
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from core import models
 
 
+def estimated_count(model, using):
+    """ Return the planner's estimate of the rows in model's table, or None
+    when the table has not been analyzed yet. """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """ Paginator using the table's row estimate for unfiltered lists.
+
+    COUNT(*) reads the whole table, which takes seconds on large tables.
+    pg_class.reltuples is kept up to date by autovacuum. Filtered lists and
+    small tables are counted exactly.
+    """
+    threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.threshold:
+                return estimate
+
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """ Changelist settings for tables too large to count. """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    # Newest first, read from the primary key index.
+    ordering = ['-id']
+
+
 class UserAdmin(BaseUserAdmin):
     """ Define the admin pages for users."""
     ordering = ['id']
@@ -63,8 +108,42 @@ class UserAdmin(BaseUserAdmin):
     readonly_fields = ['last_login']
 
 
+# Searches match from the start of the name: the prefix ("^") lookup is
+# served by the UPPER(...) text_pattern_ops indexes, a contains search
+# would scan the table.
+
+
+class RecipeAdmin(LargeTableAdmin):
+    list_display = ['title', 'user', 'time_minutes', 'rating']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    autocomplete_fields = ['tags']
+    search_fields = ['^title']
+
+
+class TagAdmin(LargeTableAdmin):
+    list_display = ['name', 'user']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    search_fields = ['^name']
+
+
+class IngredientAdmin(LargeTableAdmin):
+    list_display = ['name', 'user']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    search_fields = ['^name']
+
+
+class RecipeIngredientAdmin(LargeTableAdmin):
+    list_display = ['__str__', 'recipe']
+    list_select_related = ['recipe', 'ingredient']
+    raw_id_fields = ['recipe', 'ingredient']
+    search_fields = ['^ingredient__name']
+
+
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.Recipe)
-admin.site.register(models.Tag)
-admin.site.register(models.Ingredient)
-admin.site.register(models.RecipeIngredient)
+admin.site.register(models.Recipe, RecipeAdmin)
+admin.site.register(models.Tag, TagAdmin)
+admin.site.register(models.Ingredient, IngredientAdmin)
+admin.site.register(models.RecipeIngredient, RecipeIngredientAdmin)
@@ -0,0 +1,310 @@
+"""
+Load-testing harness replaying a weighted mix of API calls.
+
+Calls go either through the WSGI app in-process or over HTTP to a running
+stack (for example uWSGI behind nginx from docker-compose-deploy.yml).
+"""
+import json
+import math
+import random
+import re
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+
+from core.models import AuthToken
+from core.queries import record_queries
+
+# Relative frequency of each operation in the replayed traffic.
+OPERATION_WEIGHTS = {
+    'recipe_list': 30,
+    'recipe_filter': 15,
+    'recipe_detail': 20,
+    'recipe_create': 8,
+    'recipe_update': 7,
+    'tag_list': 10,
+    'ingredient_list': 10,
+}
+
+_SERVER_TIMING_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+class InProcessTransport:
+    """ Send requests straight to the WSGI handler and count queries. """
+
+    def __init__(self):
+        self.client = Client()
+
+    def request(self, method, path, token=None, payload=None):
+        extra = {'HTTP_AUTHORIZATION': f'Token {token}'} if token else {}
+        data = json.dumps(payload) if payload is not None else ''
+
+        with record_queries() as recorder:
+            res = self.client.generic(
+                method, path, data,
+                content_type='application/json',
+                **extra,
+            )
+
+        body = json.loads(res.content) if res.content else None
+        return res.status_code, body, recorder.count
+
+
+class HttpTransport:
+    """ Send requests to a running server.
+
+    Queries per request are read from the Server-Timing header, so they are
+    only reported when the server runs with QUERY_INSTRUMENTATION=1.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, token=None, payload=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Token {token}'
+        data = json.dumps(payload).encode() if payload is not None else None
+        req = urllib.request.Request(
+            self.base_url + path, data=data, headers=headers, method=method)
+
+        try:
+            with urllib.request.urlopen(req) as res:
+                status, content, timing = (
+                    res.status, res.read(), res.headers.get('Server-Timing'))
+        except urllib.error.HTTPError as error:
+            status, content, timing = (
+                error.code, error.read(), error.headers.get('Server-Timing'))
+
+        match = _SERVER_TIMING_QUERIES_RE.search(timing or '')
+        queries = int(match.group(1)) if match else None
+        body = json.loads(content) if content else None
+        return status, body, queries
+
+
+def _recipe_ingredients_url(recipe_id):
+    return reverse('recipe:recipe-ingredient-list', args=[recipe_id])
+
+
+def _post(transport, path, payload, token=None, expected=201):
+    status, body, queries = transport.request('POST', path, token, payload)
+    if status != expected:
+        raise RuntimeError(f'Seeding {path} failed with {status}: {body}')
+
+    return body
+
+
+def create_account(email):
+    """ Create a user and return an API token for it.
+
+    Accounts are created in the database, not through the sign-up and
+    login endpoints, whose throttles would stop the seeding after a few
+    users.
+    """
+    user = get_user_model().objects.create_user(
+        email=email, password='benchpass123', name='Bench User')
+
+    return AuthToken.objects.create(user=user).key
+
+
+def seed(transport, users, recipes, tags, ingredients, rng):
+    """ Create the dataset and return one dict per user.
+
+    Users and their tokens are created in the database the command is
+    configured for, which must be the server's. Everything else goes
+    through the API.
+    """
+    run_id = uuid.uuid4().hex[:8]
+    tag_names = [f'tag{i}' for i in range(tags)]
+    ingredient_names = [f'ingredient{i}' for i in range(ingredients)]
+    dataset = []
+
+    for user_index in range(users):
+        token = create_account(f'bench-{run_id}-{user_index}@example.com')
+
+        tag_ids = [
+            _post(transport, reverse('recipe:tag-list'),
+                  {'name': name}, token)['id']
+            for name in tag_names
+        ]
+        ingredient_ids = [
+            _post(transport, reverse('recipe:ingredient-list'),
+                  {'name': name}, token)['id']
+            for name in ingredient_names
+        ]
+
+        recipe_ids = []
+        for recipe_index in range(recipes):
+            recipe = _post(transport, reverse('recipe:recipe-list'), {
+                'title': f'Recipe {recipe_index}',
+                'time_minutes': rng.randint(5, 120),
+                'tags': [
+                    {'name': name}
+                    for name in rng.sample(tag_names, min(2, tags))
+                ],
+            }, token)
+            for name in rng.sample(ingredient_names, min(2, ingredients)):
+                _post(transport, _recipe_ingredients_url(recipe['id']), {
+                    'recipe': recipe['id'],
+                    'ingredient': {'name': name},
+                    'quantity': rng.randint(1, 500),
+                    'units': 'gm',
+                }, token)
+            recipe_ids.append(recipe['id'])
+
+        dataset.append({
+            'token': token,
+            'recipe_ids': recipe_ids,
+            'tag_ids': tag_ids,
+            'ingredient_ids': ingredient_ids,
+        })
+
+    return dataset
+
+
+def _ids_param(ids, rng):
+    return ','.join(str(i) for i in rng.sample(ids, min(2, len(ids))))
+
+
+def perform(transport, operation, user, rng):
+    """ Run one operation for the user and return (status, queries). """
+    token = user['token']
+    recipes_url = reverse('recipe:recipe-list')
+
+    if operation == 'recipe_list':
+        result = transport.request('GET', recipes_url, token)
+    elif operation == 'recipe_filter':
+        params = []
+        if user['tag_ids']:
+            params.append(f'tags={_ids_param(user["tag_ids"], rng)}')
+        if user['ingredient_ids']:
+            params.append(
+                f'ingredients={_ids_param(user["ingredient_ids"], rng)}')
+        result = transport.request(
+            'GET', f'{recipes_url}?{"&".join(params)}', token)
+    elif operation == 'recipe_detail':
+        recipe_id = rng.choice(user['recipe_ids'])
+        result = transport.request(
+            'GET', reverse('recipe:recipe-detail', args=[recipe_id]), token)
+    elif operation == 'recipe_create':
+        result = transport.request('POST', recipes_url, token, {
+            'title': 'Benchmark recipe',
+            'time_minutes': rng.randint(5, 120),
+            'tags': [{'name': 'benchmark'}],
+        })
+        if result[0] == 201:
+            user['recipe_ids'].append(result[1]['id'])
+    elif operation == 'recipe_update':
+        recipe_id = rng.choice(user['recipe_ids'])
+        result = transport.request(
+            'PATCH', reverse('recipe:recipe-detail', args=[recipe_id]),
+            token, {'title': f'Updated {rng.randint(0, 1000)}'})
+    elif operation == 'tag_list':
+        result = transport.request('GET', reverse('recipe:tag-list'), token)
+    elif operation == 'ingredient_list':
+        result = transport.request(
+            'GET', reverse('recipe:ingredient-list'), token)
+    else:
+        raise ValueError(f'Unknown operation: {operation}')
+
+    status, body, queries = result
+    return status, queries
+
+
+def plan(dataset, requests, rng, weights=None):
+    """ Return the (operation, user, seed) calls to replay, in order. """
+    weights = weights or OPERATION_WEIGHTS
+    operations = rng.choices(
+        list(weights), weights=list(weights.values()), k=requests)
+
+    return [
+        (operation, rng.choice(dataset), rng.getrandbits(32))
+        for operation in operations
+    ]
+
+
+def replay(transport, calls, concurrency=1):
+    """ Replay the calls and return (samples, elapsed seconds). """
+
+    def timed(call):
+        operation, user, seed = call
+        start = perf_counter()
+        status, queries = perform(
+            transport, operation, user, random.Random(seed))
+        return operation, perf_counter() - start, status, queries
+
+    start = perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(timed, calls))
+    else:
+        samples = [timed(call) for call in calls]
+
+    return samples, perf_counter() - start
+
+
+def percentile(values, pct):
+    """ Return the nearest-rank percentile of the values. """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _summarize_group(samples):
+    latencies = [latency * 1000 for _, latency, _, _ in samples]
+    queries = [q for _, _, _, q in samples if q is not None]
+
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for _, _, status, _ in samples if status >= 400),
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'queries_per_request': (
+            sum(queries) / len(queries) if queries else None),
+    }
+
+
+def summarize(samples, elapsed):
+    """ Return overall and per-operation statistics of a replay. """
+    operations = sorted({sample[0] for sample in samples})
+
+    overall = _summarize_group(samples)
+    overall['rps'] = len(samples) / elapsed if elapsed else None
+
+    return {
+        'overall': overall,
+        'operations': {
+            operation: _summarize_group(
+                [s for s in samples if s[0] == operation])
+            for operation in operations
+        },
+    }
+
+
+def compare(baseline, current):
+    """ Return (name, metric, baseline, current, change %) rows. """
+    rows = []
+    groups = [('overall', baseline['overall'], current['overall'])]
+    groups += [
+        (name, baseline['operations'][name], stats)
+        for name, stats in current['operations'].items()
+        if name in baseline['operations']
+    ]
+
+    for name, old, new in groups:
+        for metric in ('rps', 'p50_ms', 'p95_ms', 'p99_ms',
+                       'queries_per_request'):
+            if old.get(metric) and new.get(metric) is not None:
+                change = (new[metric] - old[metric]) / old[metric] * 100
+                rows.append((name, metric, old[metric], new[metric], change))
+
+    return rows
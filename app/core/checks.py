@@ -0,0 +1,29 @@
+"""
+System checks of the app's settings.
+"""
+from django.conf import settings
+from django.core import checks
+
+# Cache backends whose entries other processes can't see.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@checks.register(checks.Tags.caches, checks.Tags.database)
+def check_replica_cache(app_configs, **kwargs):
+    """ Replica reads need a cache shared by every worker, or a user's
+    recent write only pins them to the primary in one process. """
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DATABASE_REPLICAS and backend in PROCESS_LOCAL_CACHES:
+        return [
+            checks.Error(
+                'Read replicas are configured but the default cache is '
+                f'{backend}, which is not shared between processes.',
+                hint='Set CACHE_BACKEND=redis, or unset DB_REPLICA_HOSTS.',
+                id='core.E001',
+            )
+        ]
+
+    return []
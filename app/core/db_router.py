@@ -0,0 +1,58 @@
+"""
+Database routing between the primary and read replicas.
+"""
+import random
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+
+PRIMARY_DB = 'default'
+
+_state = threading.local()
+
+
+def _pin_key(user_id):
+    return f'db-router:pin-primary:{user_id}'
+
+
+def enable_replica_reads():
+    """ Route reads of the current thread to a replica. """
+    _state.use_replica = True
+
+
+def disable_replica_reads():
+    """ Route reads of the current thread back to the primary. """
+    _state.use_replica = False
+
+
+def pin_to_primary(user):
+    """ Keep routing the user's reads to the primary for a short window. """
+    cache.set(_pin_key(user.pk), True, settings.DB_REPLICA_STICKY_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    """ Return True if the user wrote recently. """
+    return cache.get(_pin_key(user.pk), False)
+
+
+class PrimaryReplicaRouter:
+    """ Send writes to the primary and opted-in reads to a replica. """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and getattr(_state, 'use_replica', False):
+            return random.choice(replicas)
+
+        return PRIMARY_DB
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication.
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,162 @@
+"""
+Deleting recipes and whole accounts without the ORM collector.
+"""
+import logging
+import time
+
+from django.core.files.storage import default_storage
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import (
+    AuthToken,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    Tag,
+    User,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def remove_files(names):
+    """ Remove stored files, skipping the ones already gone. """
+    for name in names:
+        if not name:
+            continue
+        try:
+            default_storage.delete(name)
+        except OSError:
+            logger.warning('Could not remove file %s', name, exc_info=True)
+
+
+def remove_unreferenced_images(names):
+    """ Remove recipe images no recipe points to any more.
+
+    Duplicated recipes share their image file, so a file is only removed
+    with the last recipe using it.
+    """
+    in_use = set(
+        Recipe.objects.filter(image__in=names)
+        .values_list('image', flat=True)
+    )
+    remove_files(set(names) - in_use)
+
+
+def delete_recipes(user, recipe_ids):
+    """ Delete the user's recipes among recipe_ids and return their ids.
+
+    Children are removed with one set-based DELETE per table instead of
+    the ORM collector loading them first. Images are removed after the
+    transaction commits.
+    """
+    if not recipe_ids:
+        return []
+
+    db = router.db_for_write(Recipe)
+    connection = connections[db]
+    qn = connection.ops.quote_name
+    recipe_table = qn(Recipe._meta.db_table)
+    children = [
+        qn(RecipeIngredient._meta.db_table),
+        qn(Recipe.tags.through._meta.db_table),
+    ]
+    params = [list(recipe_ids), user.pk]
+
+    with transaction.atomic(using=db), connection.cursor() as cursor:
+        for table in children:
+            cursor.execute(
+                f'DELETE FROM {table} AS child USING {recipe_table} AS r '
+                'WHERE child.recipe_id = r.id '
+                'AND r.id = ANY(%s) AND r.user_id = %s',
+                params,
+            )
+        cursor.execute(
+            f'DELETE FROM {recipe_table} '
+            'WHERE id = ANY(%s) AND user_id = %s '
+            'RETURNING id, image',
+            params,
+        )
+        rows = cursor.fetchall()
+
+        names = [image for pk, image in rows if image]
+        if names:
+            transaction.on_commit(
+                lambda: remove_unreferenced_images(names), using=db)
+
+    return [pk for pk, image in rows]
+
+
+def request_account_deletion(user):
+    """ Deactivate the user and queue the account for deletion.
+
+    Logging in and refreshing stop working straight away. The data is
+    removed later by delete_account().
+    """
+    with transaction.atomic():
+        User.objects.filter(pk=user.pk).update(
+            is_active=False,
+            deletion_requested=timezone.now(),
+            token_version=F('token_version') + 1,
+        )
+        AuthToken.objects.filter(user_id=user.pk).delete()
+
+
+def delete_in_batches(queryset, batch_size=1000, sleep=0, on_batch=None):
+    """ Delete the rows of queryset in batches walked by primary key.
+
+    Each batch is deleted in its own transaction. on_batch is called with
+    the batch's primary keys inside that transaction.
+    """
+    deleted = 0
+    last_pk = None
+    while True:
+        batch = queryset.order_by('pk')
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        keys = list(batch.values_list('pk', flat=True)[:batch_size])
+        if not keys:
+            break
+
+        with transaction.atomic():
+            if on_batch is not None:
+                on_batch(keys)
+            count, _ = queryset.model.objects.filter(pk__in=keys).delete()
+        deleted += count
+        last_pk = keys[-1]
+        if len(keys) < batch_size:
+            break
+        time.sleep(sleep)
+
+    return deleted
+
+
+def _remove_images_on_commit(keys):
+    names = list(
+        Recipe.objects.filter(pk__in=keys)
+        .exclude(image='')
+        .exclude(image=None)
+        .values_list('image', flat=True)
+    )
+    if names:
+        transaction.on_commit(lambda: remove_unreferenced_images(names))
+
+
+def delete_account(user, batch_size=1000, sleep=0):
+    """ Delete a user's data child tables first, then the user. """
+    RecipeTag = Recipe.tags.through
+    steps = [
+        (RecipeIngredient.objects.filter(recipe__user=user), None),
+        (RecipeTag.objects.filter(recipe__user=user), None),
+        (Recipe.objects.filter(user=user), _remove_images_on_commit),
+        (Tag.objects.filter(user=user), None),
+        (Ingredient.objects.filter(user=user), None),
+        (AuthToken.objects.filter(user=user), None),
+    ]
+    for queryset, on_batch in steps:
+        delete_in_batches(queryset, batch_size, sleep, on_batch)
+
+    # Only rows written while the deletion ran are left to cascade.
+    User.objects.filter(pk=user.pk).delete()
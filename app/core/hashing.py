@@ -0,0 +1,119 @@
+"""
+Password hashing offloaded to a bounded process pool.
+
+Hashing is CPU bound, so it runs outside the request thread in a pool of
+PASSWORD_HASHING_WORKERS processes. At most PASSWORD_HASHING_QUEUE more
+calls may wait for a free worker; beyond that the request is rejected with
+429 and a Retry-After header.
+
+Only the API calls into the pool. Passwords set anywhere else, e.g. by
+createsuperuser or the admin, are hashed in the calling thread.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import Throttled
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+_slots = None
+
+
+class HashingBusy(Throttled):
+    default_detail = _('Too many password checks in progress.')
+
+
+def _init_worker():
+    django.setup()
+
+
+def _make_password(password):
+    return hashers.make_password(password)
+
+
+def _verify_password(password, encoded):
+    upgraded = []
+    valid = hashers.check_password(
+        password,
+        encoded,
+        setter=lambda raw: upgraded.append(hashers.make_password(raw)),
+    )
+
+    return valid, upgraded[0] if upgraded else None
+
+
+def _get_executor():
+    """ Return the pool and its admission slots, creating them per process.
+
+    uWSGI forks its workers after loading the app, so a pool inherited from
+    the master is replaced on first use.
+    """
+    global _executor, _executor_pid, _slots
+
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            workers = settings.PASSWORD_HASHING_WORKERS
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+            )
+            _slots = threading.BoundedSemaphore(
+                workers + settings.PASSWORD_HASHING_QUEUE)
+            _executor_pid = os.getpid()
+
+        return _executor, _slots
+
+
+def _reset_executor(executor):
+    global _executor
+
+    with _lock:
+        if _executor is executor:
+            _executor = None
+
+
+def _run(func, *args):
+    # Daemonic processes, like the workers of test --parallel, can't start
+    # a pool of their own.
+    if not settings.PASSWORD_HASHING_WORKERS or \
+            multiprocessing.current_process().daemon:
+        return func(*args)
+
+    executor, slots = _get_executor()
+    if not slots.acquire(blocking=False):
+        raise HashingBusy(wait=settings.PASSWORD_HASHING_RETRY_AFTER)
+
+    try:
+        try:
+            return executor.submit(func, *args).result()
+        except BrokenProcessPool:
+            # A pool process died, e.g. killed by the OOM killer. Start a
+            # new pool and try once more.
+            _reset_executor(executor)
+            executor, _ = _get_executor()
+            return executor.submit(func, *args).result()
+    finally:
+        slots.release()
+
+
+def make_password(password):
+    """ Hash the password with the preferred hasher. """
+    return _run(_make_password, password)
+
+
+def verify_password(password, encoded):
+    """ Return (valid, upgraded hash or None) for the password.
+
+    The upgraded hash is set when the stored one uses an outdated hasher or
+    iteration count.
+    """
+    return _run(_verify_password, password, encoded)
@@ -0,0 +1,69 @@
+"""
+Readiness checks of the app's dependencies.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from time import monotonic, perf_counter
+
+from django.conf import settings
+
+from core import probes
+
+logger = logging.getLogger(__name__)
+
+CHECKS = {
+    'database': probes.probe_database,
+    'cache': probes.probe_cache,
+    'media': probes.probe_media,
+}
+
+# Checks that outlive their timeout keep their thread, so a hanging
+# dependency can't make later probes start more threads.
+_executor = ThreadPoolExecutor(
+    max_workers=len(CHECKS), thread_name_prefix='health-check')
+_lock = threading.Lock()
+_last = None
+
+
+def _timed(check):
+    start = perf_counter()
+    check()
+    return (perf_counter() - start) * 1000
+
+
+def run_checks():
+    """ Run every check in parallel and return the result per check. """
+    futures = {
+        name: _executor.submit(_timed, check)
+        for name, check in CHECKS.items()
+    }
+    deadline = monotonic() + settings.HEALTH_CHECK_TIMEOUT
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            ms = future.result(timeout=max(deadline - monotonic(), 0))
+            results[name] = {'ok': True, 'ms': round(ms, 1)}
+        except TimeoutError:
+            logger.warning('Health check %s timed out', name)
+            results[name] = {'ok': False, 'error': 'timed out'}
+        except Exception:
+            # The exception may reveal hosts or paths, so it only goes to
+            # the log.
+            logger.exception('Health check %s failed', name)
+            results[name] = {'ok': False, 'error': 'unavailable'}
+
+    return results
+
+
+def readiness():
+    """ Return the latest check results, at most HEALTH_CHECK_CACHE_SECONDS
+    old. Concurrent callers share one run of the checks. """
+    global _last
+    with _lock:
+        if _last is None or \
+                monotonic() - _last[0] >= settings.HEALTH_CHECK_CACHE_SECONDS:
+            _last = (monotonic(), run_checks())
+
+        return _last[1]
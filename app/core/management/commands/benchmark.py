@@ -0,0 +1,136 @@
+""" Django command to load-test the API with realistic traffic """
+import json
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from core import benchmark
+
+
+class Command(BaseCommand):
+    """Django command to replay a weighted API traffic mix"""
+
+    help = (
+        'Seed users x recipes x tags x ingredients and replay a weighted mix '
+        'of API calls. Without --url the calls run in-process against a '
+        'throwaway test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            help='Base URL of a running server, e.g. http://proxy:8000.',
+        )
+        parser.add_argument('--users', type=int, default=5)
+        parser.add_argument('--recipes', type=int, default=20,
+                            help='Recipes per user.')
+        parser.add_argument('--tags', type=int, default=5,
+                            help='Tags per user.')
+        parser.add_argument('--ingredients', type=int, default=10,
+                            help='Ingredients per user.')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=1,
+                            help='Parallel clients, only used with --url.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--label', default='',
+                            help='Stored in the results, e.g. a commit.')
+        parser.add_argument('--output',
+                            help='Write the results to this JSON file.')
+        parser.add_argument('--compare',
+                            help='Baseline JSON file to compare against.')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['recipes'] < 1:
+            raise CommandError('--users and --recipes must be at least 1.')
+
+        if options['url']:
+            transport = benchmark.HttpTransport(options['url'])
+            results = self._run(transport, options, options['concurrency'])
+        else:
+            setup_test_environment()
+            old_config = setup_databases(verbosity=0, interactive=False)
+            try:
+                results = self._run(
+                    benchmark.InProcessTransport(), options, 1)
+            finally:
+                teardown_databases(old_config, verbosity=0)
+                teardown_test_environment()
+
+        self._report(results)
+
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                baseline = json.load(baseline_file)
+            self._report_comparison(baseline, results)
+
+        if options['output']:
+            with open(options['output'], 'w') as output_file:
+                json.dump(results, output_file, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+    def _run(self, transport, options, concurrency):
+        rng = random.Random(options['seed'])
+
+        self.stdout.write('Seeding dataset ...')
+        dataset = benchmark.seed(
+            transport,
+            users=options['users'],
+            recipes=options['recipes'],
+            tags=options['tags'],
+            ingredients=options['ingredients'],
+            rng=rng,
+        )
+
+        self.stdout.write(f'Replaying {options["requests"]} requests ...')
+        calls = benchmark.plan(dataset, options['requests'], rng)
+        samples, elapsed = benchmark.replay(transport, calls, concurrency)
+
+        return {
+            'label': options['label'],
+            'mode': 'http' if options['url'] else 'in-process',
+            'dataset': {
+                key: options[key]
+                for key in ('users', 'recipes', 'tags', 'ingredients')
+            },
+            'concurrency': concurrency,
+            **benchmark.summarize(samples, elapsed),
+        }
+
+    def _format(self, value, spec='.1f'):
+        return 'n/a' if value is None else format(value, spec)
+
+    def _report(self, results):
+        self.stdout.write(
+            f'{"Operation":<18}{"Reqs":>6}{"Errors":>8}{"p50 ms":>9}'
+            f'{"p95 ms":>9}{"p99 ms":>9}{"Queries":>9}'
+        )
+        rows = [
+            *results['operations'].items(),
+            ('overall', results['overall']),
+        ]
+        for name, stats in rows:
+            self.stdout.write(
+                f'{name:<18}{stats["requests"]:>6}{stats["errors"]:>8}'
+                f'{self._format(stats["p50_ms"]):>9}'
+                f'{self._format(stats["p95_ms"]):>9}'
+                f'{self._format(stats["p99_ms"]):>9}'
+                f'{self._format(stats["queries_per_request"]):>9}'
+            )
+        self.stdout.write(
+            f'Throughput: {self._format(results["overall"]["rps"])} req/s')
+
+    def _report_comparison(self, baseline, results):
+        label = baseline.get('label') or 'baseline'
+        self.stdout.write(f'Compared with {label}:')
+        for name, metric, old, new, change in benchmark.compare(
+                baseline, results):
+            self.stdout.write(
+                f'{name:<18}{metric:<22}{old:>10.1f}{new:>10.1f}'
+                f'{change:>+9.1f}%'
+            )
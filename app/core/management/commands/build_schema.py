@@ -0,0 +1,24 @@
+""" Django command to write the OpenAPI schema to a static file """
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.schema import SCHEMA_DIR, write_schema
+
+
+class Command(BaseCommand):
+    """Django command to prebuild the OpenAPI schema"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--directory',
+            help='Output directory. Defaults to STATIC_ROOT/schema.',
+        )
+
+    def handle(self, *args, **options):
+        directory = options['directory'] or \
+            os.path.join(settings.STATIC_ROOT, SCHEMA_DIR)
+        name = write_schema(directory)
+        self.stdout.write(
+            self.style.SUCCESS(f'Wrote {os.path.join(directory, name)}'))
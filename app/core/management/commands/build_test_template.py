@@ -0,0 +1,42 @@
+""" Django command to build a migrated template database for the tests """
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+TEMPLATE_ALIAS = 'test_template'
+
+
+class Command(BaseCommand):
+    """Django command to (re)create the test template database"""
+
+    help = (
+        'Create the database named by DB_TEST_TEMPLATE and migrate it, so '
+        'test databases can be cloned from it instead of built from scratch.'
+    )
+
+    def handle(self, *args, **options):
+        template = connection.settings_dict['TEST'].get('TEMPLATE')
+        if not template:
+            raise CommandError(
+                'Set DB_TEST_TEMPLATE and use --settings=app.settings_test.')
+        if connection.vendor != 'postgresql':
+            raise CommandError('Template databases require PostgreSQL.')
+
+        quoted = connection.ops.quote_name(template)
+        with connection._nodb_cursor() as cursor:
+            cursor.execute(f'DROP DATABASE IF EXISTS {quoted}')
+            cursor.execute(f'CREATE DATABASE {quoted}')
+
+        connections.settings[TEMPLATE_ALIAS] = {
+            **connection.settings_dict,
+            'NAME': template,
+        }
+        try:
+            call_command(
+                'migrate', database=TEMPLATE_ALIAS, verbosity=0,
+                interactive=False)
+        finally:
+            connections[TEMPLATE_ALIAS].close()
+            del connections.settings[TEMPLATE_ALIAS]
+
+        self.stdout.write(self.style.SUCCESS(f'Built template {template}'))
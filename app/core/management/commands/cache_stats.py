@@ -0,0 +1,99 @@
+""" Django command to report cache usage per key namespace """
+import os
+from collections import defaultdict
+
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+from django.core.management.base import BaseCommand, CommandError
+
+ALL_NAMESPACES = '(all)'
+
+
+def namespace_of(key):
+    """ Return the namespace of a raw cache key, e.g. 'db-router'. """
+    return key.split(':', 1)[0]
+
+
+class Command(BaseCommand):
+    """Django command to report cache hit ratio and memory per namespace"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alias',
+            default='default',
+            help='Cache alias to inspect.',
+        )
+
+    def handle(self, *args, **options):
+        cache = caches[options['alias']]
+
+        if isinstance(cache, RedisCache):
+            hits, misses, namespaces = self._redis_stats(cache)
+        elif isinstance(cache, LocMemCache):
+            hits, misses, namespaces = self._locmem_stats(cache)
+        elif isinstance(cache, FileBasedCache):
+            hits, misses, namespaces = self._file_stats(cache)
+        else:
+            raise CommandError(
+                f'Unsupported cache backend: {type(cache).__name__}')
+
+        self.stdout.write(f'Backend: {type(cache).__name__}')
+        if hits is None:
+            self.stdout.write('Hit ratio: n/a')
+        else:
+            total = hits + misses
+            ratio = hits / total if total else 0.0
+            self.stdout.write(
+                f'Hit ratio: {ratio:.2%} ({hits} hits, {misses} misses)')
+
+        self.stdout.write(f'{"Namespace":<30}{"Keys":>10}{"Bytes":>14}')
+        for name, (keys, size) in sorted(namespaces.items()):
+            self.stdout.write(f'{name:<30}{keys:>10}{size:>14}')
+
+    def _strip_key(self, cache, full_key):
+        """ Drop the KEY_PREFIX and VERSION Django adds to every key. """
+        return full_key[len(cache.make_key('')):]
+
+    def _redis_stats(self, cache):
+        client = cache._cache.get_client()
+        info = client.info('stats')
+        namespaces = defaultdict(lambda: [0, 0])
+
+        for full_key in client.scan_iter(match=cache.make_key('*')):
+            key = self._strip_key(cache, full_key.decode())
+            stats = namespaces[namespace_of(key)]
+            stats[0] += 1
+            stats[1] += client.memory_usage(full_key) or 0
+
+        return info['keyspace_hits'], info['keyspace_misses'], namespaces
+
+    def _locmem_stats(self, cache):
+        namespaces = defaultdict(lambda: [0, 0])
+        prefix = cache.make_key('')
+
+        with cache._lock:
+            items = list(cache._cache.items())
+
+        for full_key, value in items:
+            if not full_key.startswith(prefix):
+                continue
+            stats = namespaces[namespace_of(self._strip_key(cache, full_key))]
+            stats[0] += 1
+            stats[1] += len(value)
+
+        return None, None, namespaces
+
+    def _file_stats(self, cache):
+        # File names are hashes of the key, so entries can't be grouped.
+        keys = 0
+        size = 0
+        for path in cache._list_cache_files():
+            try:
+                size += os.path.getsize(path)
+            except FileNotFoundError:
+                continue
+            keys += 1
+
+        return None, None, {ALL_NAMESPACES: [keys, size]} if keys else {}
@@ -0,0 +1,53 @@
+""" Django command to delete accounts queued for deletion """
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.deletion import delete_account
+from core.models import User
+
+
+class Command(BaseCommand):
+    """Django command to delete queued accounts in small batches"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows deleted per statement.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Seconds to pause between batches.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep running and check for new accounts every INTERVAL '
+                 'seconds. By default the command exits once the queue is '
+                 'empty.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = self.delete_queued(options)
+            if deleted or not options['interval']:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Deleted {deleted} accounts'))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def delete_queued(self, options):
+        deleted = 0
+        users = User.objects.filter(
+            deletion_requested__isnull=False,
+        ).order_by('deletion_requested')
+        for user in users.iterator():
+            delete_account(user, options['batch_size'], options['sleep'])
+            deleted += 1
+        return deleted
@@ -0,0 +1,65 @@
+""" Django command to delete expired API tokens """
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import AuthToken
+
+
+class Command(BaseCommand):
+    """Django command to delete expired tokens in small batches"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Tokens deleted per statement.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Seconds to pause between batches.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep running and delete expired tokens every INTERVAL '
+                 'seconds. By default the command exits after one pass.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = self.delete_expired(options)
+            if deleted or not options['interval']:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Deleted {deleted} expired tokens'))
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def delete_expired(self, options):
+        now = timezone.now()
+        batch_size = options['batch_size']
+        deleted = 0
+
+        while True:
+            # Each batch is found through the expires index and deleted in
+            # its own short transaction.
+            keys = list(
+                AuthToken.objects.filter(expires__lte=now)
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not keys:
+                break
+
+            count, _ = AuthToken.objects.filter(pk__in=keys).delete()
+            deleted += count
+            if len(keys) < batch_size:
+                break
+            time.sleep(options['sleep'])
+
+        return deleted
@@ -0,0 +1,107 @@
+""" Django command to profile what a worker imports while booting """
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter: load the app like a worker does, then resolve
+# the URLconf as the first request would.
+BOOT_SCRIPT = '''
+import json, resource, sys, time
+start = time.perf_counter()
+module = __import__({module!r}, fromlist=['application'])
+booted = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+done = time.perf_counter()
+print(json.dumps({{
+    'boot_ms': (booted - start) * 1000,
+    'urlconf_ms': (done - booted) * 1000,
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+}}))
+'''
+
+
+def parse_importtime(output):
+    """ Return (module, self_us, cumulative_us) for each -X importtime line.
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue  # The header line.
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def by_package(imports):
+    """ Sum the self time of the imports per top-level package. """
+    totals = defaultdict(int)
+    for name, self_us, _ in imports:
+        totals[name.split('.')[0]] += self_us
+    return totals
+
+
+class Command(BaseCommand):
+    """Django command to report worker boot time, RSS and slow imports"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--module',
+            default='app.wsgi',
+            help='Module exposing the application, e.g. app.asgi.',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help='Number of imports to list.',
+        )
+        parser.add_argument(
+            '--packages',
+            action='store_true',
+            help='Group the import time by top-level package.',
+        )
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        result = subprocess.run(
+            [
+                sys.executable, '-X', 'importtime', '-c',
+                BOOT_SCRIPT.format(module=options['module']),
+            ],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        if result.returncode:
+            raise CommandError(f'Boot failed:\n{result.stderr}')
+
+        stats = json.loads(result.stdout.splitlines()[-1])
+        imports = parse_importtime(result.stderr)
+
+        self.stdout.write(f'Boot: {stats["boot_ms"]:.0f} ms')
+        self.stdout.write(f'URLconf: {stats["urlconf_ms"]:.0f} ms')
+        self.stdout.write(f'RSS: {stats["rss_kb"] / 1024:.1f} MB')
+        self.stdout.write(f'Modules: {stats["modules"]}')
+        self.stdout.write('')
+
+        if options['packages']:
+            rows = sorted(
+                by_package(imports).items(), key=lambda item: -item[1])
+            self.stdout.write(f'{"Package":<40}{"Self ms":>10}')
+            for name, self_us in rows[:options['top']]:
+                self.stdout.write(f'{name:<40}{self_us / 1000:>10.1f}')
+        else:
+            rows = sorted(imports, key=lambda item: -item[2])
+            self.stdout.write(f'{"Module":<50}{"Self ms":>10}{"Total ms":>10}')
+            for name, self_us, cumulative_us in rows[:options['top']]:
+                self.stdout.write(
+                    f'{name:<50}{self_us / 1000:>10.1f}'
+                    f'{cumulative_us / 1000:>10.1f}')
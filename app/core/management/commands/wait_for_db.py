@@ -1,25 +1,61 @@
 """ Django command to wait for database to be ready """
+import random
 import time
-from psycopg2 import OperationalError as Psycopg2OpError
 
-from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+
+from core.probes import DATABASE_ERRORS, probe_cache, probe_database
+
+# Retry within milliseconds at first, then back off to at most MAX_DELAY
+# seconds. Each wait is jittered so restarting replicas don't retry in step.
+INITIAL_DELAY = 0.05
+MAX_DELAY = 2
 
 
 class Command(BaseCommand):
     """Django command to wait for the database"""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=60,
+            help='Seconds to wait before giving up.',
+        )
+        parser.add_argument(
+            '--cache',
+            action='store_true',
+            help='Also wait for the default cache backend.',
+        )
+
     def handle(self, *args, **options):
-        self.stdout.write('Waiting for database')
+        deadline = time.monotonic() + options['timeout']
 
-        db_up = False
+        self.wait_for(
+            'Database', probe_database, DATABASE_ERRORS, deadline, options)
+        if options['cache']:
+            # Cache backends raise their client library's own errors.
+            self.wait_for('Cache', probe_cache, Exception, deadline, options)
 
-        while db_up is False:
+    def wait_for(self, name, probe, errors, deadline, options):
+        self.stdout.write(f'Waiting for {name.lower()}')
+        delay = INITIAL_DELAY
+
+        while True:
             try:
-                self.check(databases=['default'])
-                db_up = True
-            except (Psycopg2OpError, OperationalError):
-                self.stdout.write("Database unavailable, waiting 1 second ...")
-                time.sleep(1)
+                probe()
+                break
+            except errors as exc:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        f'{name} unavailable after '
+                        f'{options["timeout"]:g} seconds: {exc}')
+
+                wait = min(random.uniform(delay / 2, delay), remaining)
+                self.stdout.write(
+                    f'{name} unavailable, waiting {wait:.2f} seconds ...')
+                time.sleep(wait)
+                delay = min(delay * 2, MAX_DELAY)
 
-        self.stdout.write(self.style.SUCCESS("Database available!"))
+        self.stdout.write(self.style.SUCCESS(f'{name} available!'))
@@ -0,0 +1,54 @@
+"""
+Prometheus metrics for the API.
+
+When PROMETHEUS_MULTIPROC_DIR is set every uWSGI worker writes its samples
+to that directory and the metrics view aggregates all of them.
+"""
+import os
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    'api_request_latency_seconds',
+    'Time spent handling a request.',
+    ['route', 'method'],
+)
+RESPONSE_SIZE = Histogram(
+    'api_response_size_bytes',
+    'Size of the response body.',
+    ['route', 'method'],
+    buckets=(100, 1000, 10000, 100000, 1000000, float('inf')),
+)
+DB_QUERIES = Histogram(
+    'api_db_queries',
+    'Number of SQL queries run by a request.',
+    ['route', 'method'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, float('inf')),
+)
+AUTH_FAILURES = Counter(
+    'api_auth_failures',
+    'Rejected authentication attempts.',
+    ['reason'],
+)
+IMAGE_UPLOADS = Counter(
+    'api_image_uploads',
+    'Recipe images uploaded.',
+)
+
+
+def collect():
+    """ Return the metrics of every worker in the text exposition format. """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry)
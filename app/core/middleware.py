@@ -0,0 +1,153 @@
+"""
+Middleware for the app.
+"""
+import asyncio
+import logging
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.middleware.gzip import GZipMiddleware as BaseGZipMiddleware
+
+from core import metrics
+from core.queries import record_queries
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_view_name(request):
+    """ Return the (view, action) that handled the request. """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None, None
+
+    view = getattr(match.func, 'cls', match.func)
+    actions = getattr(match.func, 'actions', None) or {}
+
+    return view.__name__, actions.get(request.method.lower())
+
+
+class QueryInstrumentationMiddleware:
+    """ Count and time the SQL queries and the view of each request.
+
+    Enabled by QUERY_INSTRUMENTATION; when disabled Django drops the
+    middleware from the chain so it costs nothing.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSTRUMENTATION:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.threshold = settings.QUERY_INSTRUMENTATION_REPEAT_THRESHOLD
+
+    def __call__(self, request):
+        start = perf_counter()
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        view_time = perf_counter() - start
+
+        db_ms = recorder.duration * 1000
+        view_ms = view_time * 1000
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.1f};desc="{recorder.count} queries"',
+            f'view;dur={view_ms:.1f}',
+        ])
+
+        view, action = resolve_view_name(request)
+        logger.info(
+            'request method=%s path=%s view=%s action=%s status=%s '
+            'queries=%d db_ms=%.1f view_ms=%.1f',
+            request.method, request.path, view, action,
+            response.status_code, recorder.count, db_ms, view_ms,
+            extra={
+                'view': view,
+                'action': action,
+                'queries': recorder.count,
+                'db_ms': db_ms,
+                'view_ms': view_ms,
+            },
+        )
+
+        for shape, count in recorder.repeated_shapes(self.threshold).items():
+            logger.warning(
+                'repeated query view=%s action=%s count=%d sql=%s',
+                view, action, count, shape,
+                extra={'view': view, 'action': action, 'sql': shape},
+            )
+
+        return response
+
+
+class GZipMiddleware(BaseGZipMiddleware):
+    """ Compress responses of at least GZIP_MIN_LENGTH bytes.
+
+    Enabled by GZIP_RESPONSES, for deployments where the proxy doesn't
+    compress responses.
+    """
+
+    def __init__(self, get_response):
+        if not settings.GZIP_RESPONSES:
+            raise MiddlewareNotUsed()
+
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        if not response.streaming and \
+                len(response.content) < settings.GZIP_MIN_LENGTH:
+            return response
+
+        return super().process_response(request, response)
+
+
+class MetricsMiddleware:
+    """ Record latency, response size and query count per route.
+
+    Under ASGI the middleware stays async so async views don't hop to a
+    thread. Queries then run on executor threads and aren't counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Same marker as django.utils.deprecation.MiddlewareMixin.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        start = perf_counter()
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        self.observe(request, response, perf_counter() - start)
+        metrics.DB_QUERIES.labels(**self.labels(request)).observe(
+            recorder.count)
+
+        return response
+
+    async def __acall__(self, request):
+        start = perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, perf_counter() - start)
+
+        return response
+
+    def labels(self, request):
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else 'unmatched'
+        return {'route': route, 'method': request.method}
+
+    def observe(self, request, response, latency):
+        labels = self.labels(request)
+        metrics.REQUEST_LATENCY.labels(**labels).observe(latency)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.labels(**labels).observe(
+                len(response.content))
+        if response.status_code == 401:
+            metrics.AUTH_FAILURES.labels(reason='unauthenticated').inc()
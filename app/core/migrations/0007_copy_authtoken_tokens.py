@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+
+def copy_tokens(apps, schema_editor):
+    """ Carry existing DRF tokens over so clients stay logged in. """
+    Token = apps.get_model('authtoken', 'Token')
+    AuthToken = apps.get_model('core', 'AuthToken')
+    db = schema_editor.connection.alias
+    expires = timezone.now() + timedelta(seconds=settings.AUTH_TOKEN_TTL)
+
+    AuthToken.objects.using(db).bulk_create(
+        (
+            AuthToken(
+                key=token.key,
+                user_id=token.user_id,
+                created=token.created,
+                expires=expires,
+            )
+            for token in Token.objects.using(db).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authtoken', '0003_tokenproxy'),
+        ('core', '0006_authtoken'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.10 on 2026-10-19 08:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_copy_authtoken_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='authtoken',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.10 on 2026-10-19 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='deletion_requested',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
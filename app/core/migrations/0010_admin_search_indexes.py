@@ -0,0 +1,30 @@
+from django.db import migrations
+
+# Index the upper-cased names for the admin's prefix search, which runs
+# UPPER(column::text) LIKE 'PREFIX%'. The indexes are built concurrently
+# so the tables stay writable. OpClass() expressions render invalid SQL
+# on Django 4.0, hence the raw statements.
+INDEXES = [
+    ('core_recipe_title_upper_idx', 'core_recipe', 'title'),
+    ('core_tag_name_upper_idx', 'core_tag', 'name'),
+    ('core_ingredient_name_upper_idx', 'core_ingredient', 'name'),
+]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0009_user_deletion_requested'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+                f'ON "{table}" (UPPER("{column}") text_pattern_ops)'
+            ),
+            reverse_sql=f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"',
+        )
+        for name, table, column in INDEXES
+    ]
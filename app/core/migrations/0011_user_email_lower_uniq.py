@@ -0,0 +1,76 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+BATCH_SIZE = 1000
+
+
+def report_conflicts(apps, schema_editor):
+    """ Fail with a list of the users whose emails only differ in case.
+
+    Users are read in email order in batches through a server-side cursor,
+    so conflicting rows are next to each other and memory use stays flat.
+    """
+    User = apps.get_model('core', 'User')
+    rows = (
+        User.objects.using(schema_editor.connection.alias)
+        .annotate(email_lower=Lower('email'))
+        .order_by('email_lower', 'id')
+        .values_list('id', 'email', 'email_lower')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+
+    conflicts = []
+    previous = None
+    for pk, email, email_lower in rows:
+        if previous and previous[2] == email_lower:
+            conflicts.append((previous[0], previous[1], pk, email))
+        previous = (pk, email, email_lower)
+
+    if conflicts:
+        lines = [
+            f'  user {a} <{email_a}> and user {b} <{email_b}>'
+            for a, email_a, b, email_b in conflicts
+        ]
+        raise RuntimeError(
+            f'Found {len(conflicts)} pairs of users whose emails only '
+            'differ in case. Merge or rename them, then migrate again:\n'
+            + '\n'.join(lines)
+        )
+
+
+class Migration(migrations.Migration):
+    # The index is built concurrently so logins keep working.
+    atomic = False
+
+    dependencies = [
+        ('core', '0010_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(report_conflicts, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='user',
+                    constraint=models.UniqueConstraint(
+                        django.db.models.functions.text.Lower('email'),
+                        name='core_user_email_lower_uniq',
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql=(
+                        'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS '
+                        '"core_user_email_lower_uniq" '
+                        'ON "core_user" ((LOWER("email")))'
+                    ),
+                    reverse_sql=(
+                        'DROP INDEX CONCURRENTLY IF EXISTS '
+                        '"core_user_email_lower_uniq"'
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -2,12 +2,17 @@
 Database Models.
 """
 
+import binascii
 import uuid
 import os
+from datetime import timedelta
 
 from django.conf import settings
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
 from django.core.validators import validate_email
+from django.utils import timezone
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -25,15 +30,33 @@ def recipe_image_file_path(instance, filename):
 class UserManager(BaseUserManager):
     """ Manager for users."""
 
-    def create_user(self, email, password=None, **extra_fields):
-        """ Create, save and return a new user. """
+    def with_email(self, email):
+        """ Return the users with email, ignoring case.
+
+        The comparison is served by the unique index on LOWER(email).
+        """
+        return self.filter(Exact(Lower('email'), Lower(models.Value(email))))
+
+    def get_by_natural_key(self, email):
+        return self.with_email(email).get()
+
+    def create_user(self, email, password=None, password_hash=None,
+                    **extra_fields):
+        """ Create, save and return a new user.
+
+        password_hash is stored as is, for passwords already hashed by the
+        caller.
+        """
         if not email:
             raise ValueError('User must have an email address.')
 
         validate_email(email)
 
         user = self.model(email=self.normalize_email(email), **extra_fields)
-        user.set_password(password)
+        if password_hash is None:
+            user.set_password(password)
+        else:
+            user.password = password_hash
         user.save(using=self._db)
 
         return user
@@ -52,11 +75,66 @@ class User(AbstractBaseUser, PermissionsMixin):
     name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Bumped to revoke every token issued to the user.
+    token_version = models.PositiveIntegerField(default=0)
+    # Set when the user asked for the account to be deleted.
+    deletion_requested = models.DateTimeField(
+        null=True, blank=True, db_index=True)
 
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
 
+    class Meta:
+        constraints = [
+            # Emails that only differ in case belong to the same user.
+            models.UniqueConstraint(
+                Lower('email'), name='core_user_email_lower_uniq'),
+        ]
+
+    def revoke_tokens(self):
+        """ Invalidate every token issued to the user so far. """
+        type(self).objects.filter(pk=self.pk).update(
+            token_version=models.F('token_version') + 1)
+        self.refresh_from_db(fields=['token_version'])
+
+
+def token_expiry():
+    return timezone.now() + timedelta(seconds=settings.AUTH_TOKEN_TTL)
+
+
+class AuthToken(models.Model):
+    """ Expiring API token. A user has one per login, up to
+    AUTH_TOKENS_PER_USER.
+    """
+    key = models.CharField(max_length=40, primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='auth_tokens',
+    )
+    created = models.DateTimeField(auto_now_add=True)
+    expires = models.DateTimeField(default=token_expiry, db_index=True)
+    # The user's token_version when the token was issued.
+    version = models.PositiveIntegerField(default=0)
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = self.generate_key()
+            self.version = self.user.token_version
+        return super().save(*args, **kwargs)
+
+    @property
+    def is_revoked(self):
+        return self.version != self.user.token_version
+
+    @classmethod
+    def generate_key(cls):
+        return binascii.hexlify(os.urandom(20)).decode()
+
+    def __str__(self):
+        return self.key
+
 
 class Recipe(models.Model):
     user = models.ForeignKey(
@@ -74,6 +152,46 @@ class Recipe(models.Model):
     def __str__(self):
         return self.title
 
+    def duplicate(self):
+        """ Copy the recipe, its tags and its ingredients in the database.
+
+        Rows are copied with INSERT ... SELECT in one transaction and the
+        copy shares the image file with the original. Return the primary
+        key of the copy.
+        """
+        db = router.db_for_write(Recipe)
+        connection = connections[db]
+        qn = connection.ops.quote_name
+
+        def columns(model, exclude=()):
+            return ', '.join(
+                qn(field.column) for field in model._meta.concrete_fields
+                if not field.primary_key and field.column not in exclude
+            )
+
+        with transaction.atomic(using=db), connection.cursor() as cursor:
+            table = qn(Recipe._meta.db_table)
+            cursor.execute(
+                f'INSERT INTO {table} ({columns(Recipe)}) '
+                f'SELECT {columns(Recipe)} FROM {table} WHERE {qn("id")} = %s '
+                f'RETURNING {qn("id")}',
+                [self.pk],
+            )
+            pk = cursor.fetchone()[0]
+
+            recipe_id = qn('recipe_id')
+            for model in (Recipe.tags.through, RecipeIngredient):
+                table = qn(model._meta.db_table)
+                names = columns(model, exclude=['recipe_id'])
+                cursor.execute(
+                    f'INSERT INTO {table} ({recipe_id}, {names}) '
+                    f'SELECT %s, {names} FROM {table} '
+                    f'WHERE {recipe_id} = %s',
+                    [pk, self.pk],
+                )
+
+        return pk
+
 
 class Tag(models.Model):
     user = models.ForeignKey(
@@ -0,0 +1,55 @@
+"""
+Checks that the services the app depends on are reachable.
+"""
+import socket
+import tempfile
+
+import psycopg2
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+# Seconds allowed for a single connection attempt.
+PROBE_TIMEOUT = 2
+
+DATABASE_ERRORS = (OSError, psycopg2.OperationalError)
+
+
+def probe_database(alias='default'):
+    """ Connect to the database and run SELECT 1.
+
+    A plain TCP connect first fails fast while the server isn't listening,
+    without the cost of a full PostgreSQL handshake. The connection is
+    separate from Django's and closed straight away.
+    """
+    params = connections[alias].get_connection_params()
+    # OPTIONS may already set a timeout of its own.
+    params.setdefault('connect_timeout', PROBE_TIMEOUT)
+    host = params.get('host')
+    if host and not host.startswith('/'):
+        port = int(params.get('port') or 5432)
+        with socket.create_connection((host, port), timeout=PROBE_TIMEOUT):
+            pass
+
+    conn = psycopg2.connect(**params)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    finally:
+        conn.close()
+
+
+def probe_cache(alias='default'):
+    """ Write and read back a key through the cache backend. """
+    cache = caches[alias]
+    cache.set('probe', 1, 10)
+    if cache.get('probe') != 1:
+        raise OSError('Cache did not return the probe key')
+
+
+def probe_media():
+    """ Create and remove a file in MEDIA_ROOT. """
+    with tempfile.NamedTemporaryFile(
+            dir=settings.MEDIA_ROOT, prefix='.probe-'):
+        pass
@@ -0,0 +1,64 @@
+"""
+Helpers for recording the SQL queries issued while handling a request.
+"""
+import re
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+
+from django.db import connections
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+
+
+def sql_shape(sql):
+    """ Return the SQL with literals and parameter lists collapsed.
+
+    Queries that only differ by their parameters share the same shape,
+    which is how repeated (N+1) queries are spotted.
+    """
+    shape = _STRING_RE.sub('?', sql)
+    shape = _NUMBER_RE.sub('?', shape)
+    return _IN_LIST_RE.sub('(...)', shape)
+
+
+class QueryRecorder:
+    """ Execute wrapper recording each query and its duration. """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(duration for sql, duration in self.queries)
+
+    def repeated_shapes(self, threshold):
+        """ Return {shape: count} for shapes run more than threshold times. """
+        shapes = Counter(sql_shape(sql) for sql, duration in self.queries)
+        return {
+            shape: count for shape, count in shapes.items()
+            if count > threshold
+        }
+
+
+@contextmanager
+def record_queries():
+    """ Record the queries run on every database connection. """
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
@@ -0,0 +1,109 @@
+"""
+The OpenAPI schema, generated once and served as a static file.
+"""
+import functools
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+# Directory of the schema files, relative to STATIC_ROOT.
+SCHEMA_DIR = 'schema'
+MANIFEST_NAME = 'manifest.json'
+
+accepts_gzip = re.compile(r'\bgzip\b')
+
+
+def generate_schema():
+    """ Return the OpenAPI schema rendered as JSON. """
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def write_schema(directory):
+    """ Write the schema to directory and return its file name.
+
+    The name contains a hash of the content, so the file can be cached
+    forever. A gzipped copy is written next to it, and manifest.json maps
+    openapi.json to the current file.
+    """
+    content = generate_schema()
+    version = hashlib.sha256(content).hexdigest()[:12]
+    name = f'openapi.{version}.json'
+
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, name), 'wb') as f:
+        f.write(content)
+    with open(os.path.join(directory, f'{name}.gz'), 'wb') as f:
+        f.write(gzip.compress(content, mtime=0))
+    with open(os.path.join(directory, MANIFEST_NAME), 'w') as f:
+        json.dump({'openapi.json': name}, f)
+
+    return name
+
+
+@functools.lru_cache(maxsize=None)
+def schema_url():
+    """ Return the URL of the prebuilt schema, or None when there is none.
+    """
+    path = os.path.join(settings.STATIC_ROOT, SCHEMA_DIR, MANIFEST_NAME)
+    try:
+        with open(path) as f:
+            name = json.load(f)['openapi.json']
+    except (OSError, ValueError, KeyError):
+        return None
+
+    # Not looked up in the static files manifest: the name is already
+    # versioned.
+    return f'{settings.STATIC_URL}{SCHEMA_DIR}/{name}'
+
+
+class CachedSchemaView(SpectacularAPIView):
+    """ Schema view rendering and compressing the schema once per process.
+    """
+    rendered = {}
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get('lang') or request.GET.get('version'):
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        if type(renderer) not in self.rendered:
+            data = super().get(request, *args, **kwargs).data
+            content = renderer.render(
+                data, renderer.media_type, self.get_renderer_context())
+            self.rendered[type(renderer)] = (
+                content, gzip.compress(content, mtime=0))
+
+        content, compressed = self.rendered[type(renderer)]
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type += f'; charset={renderer.charset}'
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if accepts_gzip.search(accept_encoding):
+            response = HttpResponse(compressed, content_type=content_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(content, content_type=content_type)
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
+
+
+class CachedSchemaSwaggerView(SpectacularSwaggerView):
+    """ Swagger UI loading the prebuilt schema when there is one. """
+
+    def _get_schema_url(self, request):
+        url = schema_url()
+        if url is None or request.GET.get('lang') or \
+                request.GET.get('version'):
+            return super()._get_schema_url(request)
+        return url
@@ -0,0 +1,47 @@
+"""
+Storage for the collected static files.
+"""
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+COMPRESSED_EXTENSIONS = ('.css', '.js', '.json', '.svg', '.txt', '.html')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ Manifest storage writing compressed copies of the hashed files.
+
+    Every hashed text file gets a .gz sibling, so the proxy can serve it
+    without compressing per request. Until collectstatic has written a
+    manifest, e.g. in development or under the stock test runner, files
+    are served under their plain names.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+
+        if dry_run:
+            return
+
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSED_EXTENSIONS):
+                self.compress(hashed_name)
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        compressed = gzip.compress(content, 9, mtime=0)
+        # Only keep copies that are worth decompressing.
+        if len(compressed) < len(content):
+            with open(f'{path}.gz', 'wb') as f:
+                f.write(compressed)
+        elif os.path.exists(f'{path}.gz'):
+            os.remove(f'{path}.gz')
@@ -0,0 +1,101 @@
+"""
+Query budgets for the API tests.
+
+Each API call made through APIClient in a decorated test is checked
+against query_budgets.json, keyed by '<METHOD> <url name>'. The budget is
+'queries' plus 'per_item' for each object in the response, so a list
+endpoint with a per_item of 0 fails as soon as it grows an N+1 query.
+Calling an endpoint without a budget fails too.
+"""
+import functools
+import json
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+from rest_framework.test import APIClient
+
+from core.queries import record_queries, sql_shape
+
+BUDGETS_PATH = Path(__file__).resolve().parent / 'query_budgets.json'
+
+_original_request = APIClient.request
+
+
+@functools.lru_cache()
+def load_budgets():
+    with open(BUDGETS_PATH) as budgets_file:
+        return json.load(budgets_file)
+
+
+def response_items(response):
+    """ Return how many objects the response carries. """
+    data = getattr(response, 'data', None)
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        data = data['results']
+
+    return len(data) if isinstance(data, list) else 1
+
+
+def format_queries(queries):
+    """ List each query shape, marking repeats of an earlier shape with +. """
+    lines = []
+    seen = Counter()
+    for sql in queries:
+        shape = sql_shape(sql)
+        lines.append(f'{"+" if seen[shape] else " "} {sql}')
+        seen[shape] += 1
+
+    return '\n'.join(lines)
+
+
+def check_query_budget(response, queries):
+    """ Raise AssertionError if the call ran more queries than budgeted. """
+    match = getattr(response, 'resolver_match', None)
+    if match is None:
+        return
+
+    endpoint = f'{response.request["REQUEST_METHOD"]} {match.view_name}'
+    budget = load_budgets().get(endpoint)
+    if budget is None:
+        raise AssertionError(
+            f'{endpoint} has no query budget. Add one to {BUDGETS_PATH.name} '
+            f'(it ran {len(queries)} queries).'
+        )
+
+    items = response_items(response)
+    allowed = budget['queries'] + budget.get('per_item', 0) * items
+    if len(queries) > allowed:
+        raise AssertionError(
+            f'{endpoint} ran {len(queries)} queries for {items} item(s), '
+            f'budget is {allowed} ({budget["queries"]} + '
+            f'{budget.get("per_item", 0)} per item). '
+            f'Repeated query shapes are marked with +:\n'
+            f'{format_queries(queries)}'
+        )
+
+
+def _budgeted_request(self, **kwargs):
+    with record_queries() as recorder:
+        response = _original_request(self, **kwargs)
+
+    check_query_budget(response, [sql for sql, duration in recorder.queries])
+    return response
+
+
+def query_budget(test):
+    """ Check every APIClient call of a test case or method against its
+    query budget. """
+    if isinstance(test, type):
+        for name in dir(test):
+            method = getattr(test, name)
+            if name.startswith('test') and callable(method):
+                setattr(test, name, query_budget(method))
+        return test
+
+    @functools.wraps(test)
+    def wrapper(*args, **kwargs):
+        with patch.object(APIClient, 'request', _budgeted_request):
+            return test(*args, **kwargs)
+
+    return wrapper
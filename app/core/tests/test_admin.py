@@ -2,11 +2,18 @@
 Tests for the Django admin modifications
 """
 
+from unittest.mock import patch
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.test import Client
 
+from core.admin import EstimatedCountPaginator, estimated_count
+from core.models import Ingredient, Recipe, RecipeIngredient, Tag
+
 
 class AdminSiteTests(TestCase):
     """ Tests for Django admin."""
@@ -43,3 +50,115 @@ class AdminSiteTests(TestCase):
         res = self.client.get(url)
 
         self.assertEqual(res.status_code, 200)
+
+
+class LargeTableAdminTests(TestCase):
+    """ Tests for the recipe, tag and ingredient admin pages."""
+
+    def setUp(self):
+        self.client = Client()
+        self.admin_user = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='testpass123',
+        )
+        self.client.force_login(self.admin_user)
+        self.add_recipes(3)
+
+    def add_recipes(self, count):
+        for i in range(count):
+            recipe = Recipe.objects.create(
+                user=self.admin_user, title=f'Soup {i}', time_minutes=5)
+            ingredient = Ingredient.objects.create(
+                user=self.admin_user, name=f'Salt {i}')
+            RecipeIngredient.objects.create(
+                recipe=recipe, ingredient=ingredient, quantity=1)
+            recipe.tags.add(
+                Tag.objects.create(user=self.admin_user, name=f'Tag {i}'))
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        for model in ('recipe', 'tag', 'ingredient', 'recipeingredient'):
+            with self.subTest(model=model):
+                url = reverse(f'admin:core_{model}_changelist')
+                before = self.count_queries(url)
+                self.add_recipes(3)
+
+                self.assertEqual(self.count_queries(url), before)
+
+    def test_change_pages(self):
+        recipe = Recipe.objects.first()
+        pages = [
+            reverse('admin:core_recipe_change', args=[recipe.id]),
+            reverse('admin:core_recipeingredient_change', args=[
+                recipe.recipe_ingredients.first().id]),
+            reverse('admin:core_recipe_add'),
+        ]
+        for url in pages:
+            with self.subTest(url=url):
+                res = self.client.get(url)
+
+                self.assertEqual(res.status_code, 200)
+
+    def test_search_matches_prefix(self):
+        Recipe.objects.create(
+            user=self.admin_user, title='Tomato soup', time_minutes=5)
+        url = reverse('admin:core_recipe_changelist')
+
+        res = self.client.get(url, {'q': 'soup'})
+
+        self.assertContains(res, 'Soup 0')
+        self.assertNotContains(res, 'Tomato soup')
+
+    def test_tag_autocomplete(self):
+        url = reverse('admin:autocomplete')
+        res = self.client.get(url, {
+            'app_label': 'core',
+            'model_name': 'recipe',
+            'field_name': 'tags',
+            'term': 'tag',
+        })
+
+        self.assertEqual(len(res.json()['results']), 3)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='testpass123',
+        )
+        for i in range(3):
+            Tag.objects.create(user=user, name=f'Tag {i}')
+
+    @patch('core.admin.estimated_count', return_value=50000)
+    def test_large_table_estimated(self, patched_estimate):
+        paginator = EstimatedCountPaginator(Tag.objects.order_by('id'), 10)
+
+        self.assertEqual(paginator.count, 50000)
+        patched_estimate.assert_called_once_with(Tag, 'default')
+
+    @patch('core.admin.estimated_count', return_value=50000)
+    def test_filtered_list_counted(self, patched_estimate):
+        tags = Tag.objects.filter(name__startswith='Tag').order_by('id')
+        paginator = EstimatedCountPaginator(tags, 10)
+
+        self.assertEqual(paginator.count, 3)
+        patched_estimate.assert_not_called()
+
+    @patch('core.admin.estimated_count', return_value=100)
+    def test_small_table_counted(self, patched_estimate):
+        paginator = EstimatedCountPaginator(Tag.objects.order_by('id'), 10)
+
+        self.assertEqual(paginator.count, 3)
+
+    def test_estimated_count(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE core_tag')
+
+        self.assertEqual(estimated_count(Tag, 'default'), 3)
@@ -0,0 +1,51 @@
+"""
+Tests for the load-testing harness
+"""
+import random
+
+from django.test import SimpleTestCase, TestCase
+
+from core import benchmark
+
+
+class PercentileTests(SimpleTestCase):
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(benchmark.percentile(values, 50), 50)
+        self.assertEqual(benchmark.percentile(values, 95), 95)
+        self.assertEqual(benchmark.percentile(values, 99), 99)
+
+    def test_percentile_empty(self):
+        self.assertIsNone(benchmark.percentile([], 50))
+
+
+class ReplayTests(TestCase):
+
+    def test_in_process_replay(self):
+        """ Test seeding and replaying every operation in-process. """
+        rng = random.Random(0)
+        transport = benchmark.InProcessTransport()
+        dataset = benchmark.seed(
+            transport, users=1, recipes=2, tags=2, ingredients=2, rng=rng)
+
+        calls = [
+            (operation, dataset[0], seed)
+            for seed, operation in enumerate(benchmark.OPERATION_WEIGHTS)
+        ]
+        samples, elapsed = benchmark.replay(transport, calls)
+        results = benchmark.summarize(samples, elapsed)
+
+        self.assertEqual(results['overall']['errors'], 0)
+        self.assertEqual(
+            set(results['operations']), set(benchmark.OPERATION_WEIGHTS))
+        self.assertGreater(results['overall']['queries_per_request'], 0)
+
+    def test_compare_reports_change(self):
+        baseline = {'overall': {'p95_ms': 10.0}, 'operations': {}}
+        current = {'overall': {'p95_ms': 15.0}, 'operations': {}}
+
+        rows = benchmark.compare(baseline, current)
+
+        self.assertEqual(rows, [('overall', 'p95_ms', 10.0, 15.0, 50.0)])
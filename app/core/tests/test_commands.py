@@ -1,34 +1,308 @@
 """ Test management commands """
 
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2Error
 
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management import call_command
-from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
 
+from core.deletion import request_account_deletion
+from core.management.commands.profile_startup import (
+    by_package,
+    parse_importtime,
+)
+from core.probes import PROBE_TIMEOUT, probe_cache, probe_database
+from core.models import (
+    AuthToken,
+    Ingredient,
+    Recipe,
+    RecipeIngredient,
+    Tag,
+)
+from core.tests.helper import create_user
 
-@patch('core.management.commands.wait_for_db.Command.check')
+
+@patch('core.management.commands.wait_for_db.probe_database')
 class CommandTests(SimpleTestCase):
 
-    def test_wait_for_db_ready(self, patched_check):
+    def test_wait_for_db_ready(self, patched_probe):
         """ Test waiting for database if database ready."""
 
-        patched_check.return_value = True
+        call_command('wait_for_db', stdout=StringIO())
+
+        patched_probe.assert_called_once_with()
+
+    @patch('time.sleep')
+    def test_wait_for_db_delay(self, patched_sleep, patched_probe):
+        """ Test waiting for database when the probe fails """
+
+        patched_probe.side_effect = [ConnectionRefusedError] * 2 + \
+            [Psycopg2Error] * 3 + [None]
+
+        call_command('wait_for_db', stdout=StringIO())
+
+        self.assertEqual(patched_probe.call_count, 6)
+
+    @patch('random.uniform', side_effect=lambda low, high: high)
+    @patch('time.sleep')
+    def test_wait_for_db_backs_off(
+            self, patched_sleep, patched_uniform, patched_probe):
+        """ Test the wait starts in milliseconds and doubles up to a cap. """
+        patched_probe.side_effect = [Psycopg2Error] * 7 + [None]
 
-        call_command('wait_for_db')
+        call_command('wait_for_db', stdout=StringIO())
 
-        patched_check.assert_called_once_with(databases=['default'])
+        delays = [c.args[0] for c in patched_sleep.call_args_list]
+        self.assertEqual(delays, [0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 2])
+        patched_uniform.assert_called_with(1, 2)
 
+    @patch('time.monotonic')
     @patch('time.sleep')
-    def test_wait_for_db_delay(self, patched_sleep, patched_check):
-        """ Test waiting for database when getting Operational Error """
+    def test_wait_for_db_timeout(
+            self, patched_sleep, patched_monotonic, patched_probe):
+        """ Test giving up once the timeout has passed. """
+        patched_probe.side_effect = Psycopg2Error
+        patched_monotonic.side_effect = [0, 1, 2, 3]
+
+        with self.assertRaises(CommandError):
+            call_command('wait_for_db', timeout=3, stdout=StringIO())
+
+        self.assertEqual(patched_probe.call_count, 3)
+
+    @patch('core.management.commands.wait_for_db.probe_cache')
+    @patch('time.sleep')
+    def test_wait_for_cache(self, patched_sleep, patched_cache, patched_probe):
+        patched_cache.side_effect = [ConnectionError, None]
+
+        call_command('wait_for_db', cache=True, stdout=StringIO())
+
+        self.assertEqual(patched_cache.call_count, 2)
+
+    @patch('core.management.commands.wait_for_db.probe_cache')
+    def test_cache_not_waited_for_by_default(
+            self, patched_cache, patched_probe):
+        call_command('wait_for_db', stdout=StringIO())
+
+        patched_cache.assert_not_called()
+
+
+class ProbeTests(SimpleTestCase):
+
+    def set_connection_params(self, **params):
+        patcher = patch.object(
+            connection, 'get_connection_params',
+            return_value={'database': 'devdb', **params},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('psycopg2.connect')
+    @patch('socket.create_connection')
+    def test_probe_database(self, patched_socket, patched_connect):
+        """ Test a TCP connect precedes SELECT 1 over psycopg2. """
+        self.set_connection_params(host='db', port='5433')
+
+        probe_database()
+
+        self.assertEqual(patched_socket.call_args.args[0], ('db', 5433))
+        self.assertEqual(patched_connect.call_args.kwargs['connect_timeout'],
+                         PROBE_TIMEOUT)
+        cursor = patched_connect.return_value.cursor.return_value.__enter__
+        cursor.return_value.execute.assert_called_once_with('SELECT 1')
+        patched_connect.return_value.close.assert_called_once_with()
+
+    @patch('psycopg2.connect')
+    @patch('socket.create_connection')
+    def test_probe_database_unix_socket(self, patched_socket, patched_connect):
+        """ Test a socket directory host skips the TCP connect. """
+        self.set_connection_params(host='/var/run/postgresql')
+
+        probe_database()
+
+        patched_socket.assert_not_called()
+        patched_connect.assert_called_once()
+
+    @patch('psycopg2.connect')
+    @patch('socket.create_connection')
+    def test_probe_database_keeps_connect_timeout(
+            self, patched_socket, patched_connect):
+        """ Test a connect_timeout from OPTIONS takes precedence. """
+        self.set_connection_params(host='db', connect_timeout=10)
+
+        probe_database()
+
+        self.assertEqual(
+            patched_connect.call_args.kwargs['connect_timeout'], 10)
+
+    @patch('psycopg2.connect')
+    @patch('socket.create_connection', side_effect=ConnectionRefusedError)
+    def test_probe_database_port_closed(self, patched_socket, patched_connect):
+        self.set_connection_params(host='db')
+
+        with self.assertRaises(ConnectionRefusedError):
+            probe_database()
+
+        patched_connect.assert_not_called()
+
+    def test_probe_cache(self):
+        probe_cache()
+
+
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'cache-stats-tests',
+        'KEY_PREFIX': 'test',
+    }
+})
+class CacheStatsCommandTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cache_stats_groups_keys_by_namespace(self):
+        """ Test cache_stats counts keys per namespace. """
+        cache.set('db-router:pin-primary:1', True)
+        cache.set('db-router:pin-primary:2', True)
+        cache.set('schema:v1', 'x' * 100)
+
+        out = StringIO()
+        call_command('cache_stats', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertIn('Hit ratio: n/a', lines)
+        db_router_line = next(
+            line for line in lines if line.startswith('db-router'))
+        self.assertEqual(db_router_line.split()[1], '2')
+        self.assertTrue(any(line.startswith('schema') for line in lines))
+
+
+class ProfileStartupCommandTests(SimpleTestCase):
+
+    def test_parse_importtime(self):
+        """ Test -X importtime output is parsed into per-module times. """
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   yaml.error\n'
+            'import time:       300 |        420 | yaml\n'
+        )
+
+        imports = parse_importtime(output)
+
+        self.assertEqual(
+            imports, [('yaml.error', 120, 120), ('yaml', 300, 420)])
+        self.assertEqual(by_package(imports), {'yaml': 420})
+
+    def test_profile_startup(self):
+        """ Test the boot of a fresh interpreter is profiled. """
+        out = StringIO()
+        call_command('profile_startup', '--top', '5', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('Boot: '))
+        self.assertTrue(any(line.startswith('app.wsgi') for line in lines))
+
+
+class BuildTestTemplateCommandTests(SimpleTestCase):
+
+    def test_build_test_template_requires_template(self):
+        """ Test building fails without a configured template name. """
+        with patch.dict(connection.settings_dict['TEST'], {'TEMPLATE': None}):
+            with self.assertRaisesRegex(CommandError, 'DB_TEST_TEMPLATE'):
+                call_command('build_test_template')
+
+
+class DeleteExpiredTokensCommandTests(TestCase):
+
+    def test_delete_expired_tokens(self):
+        """ Test only expired tokens are deleted, across batches. """
+        user = create_user()
+        past = timezone.now() - timedelta(seconds=1)
+        for _ in range(5):
+            AuthToken.objects.create(user=user, expires=past)
+        valid = AuthToken.objects.create(user=user)
+
+        call_command('delete_expired_tokens', batch_size=2, stdout=StringIO())
+
+        self.assertEqual(list(AuthToken.objects.all()), [valid])
+
+    @patch('core.management.commands.delete_expired_tokens.time.sleep')
+    def test_delete_expired_tokens_interval(self, patched_sleep):
+        """ Test --interval keeps deleting tokens between pauses. """
+        user = create_user()
+        past = timezone.now() - timedelta(seconds=1)
+        AuthToken.objects.create(user=user, expires=past)
+
+        def expire_another(seconds):
+            if patched_sleep.call_count == 2:
+                raise KeyboardInterrupt
+            AuthToken.objects.create(user=user, expires=past)
+
+        patched_sleep.side_effect = expire_another
+
+        with self.assertRaises(KeyboardInterrupt):
+            call_command(
+                'delete_expired_tokens', interval=60, stdout=StringIO())
+
+        patched_sleep.assert_called_with(60)
+        self.assertFalse(AuthToken.objects.exists())
+
+
+class DeleteAccountsCommandTests(TestCase):
+
+    def create_recipe(self, user, image=None):
+        recipe = Recipe.objects.create(
+            user=user, title='Recipe', time_minutes=5, image=image)
+        tag = Tag.objects.create(user=user, name='Tag')
+        ingredient = Ingredient.objects.create(user=user, name='Salt')
+        recipe.tags.add(tag)
+        RecipeIngredient.objects.create(
+            recipe=recipe, ingredient=ingredient, quantity=1)
+        return recipe
+
+    def test_delete_accounts(self):
+        """ Test queued accounts are deleted in batches with their files,
+        leaving other accounts alone. """
+        user = create_user()
+        other = create_user(email='other@example.com')
+        with tempfile.TemporaryDirectory() as media_root, \
+                self.settings(MEDIA_ROOT=media_root):
+            image = SimpleUploadedFile('image.jpg', b'image')
+            recipe = self.create_recipe(user, image=image)
+            for _ in range(2):
+                self.create_recipe(user)
+            kept = self.create_recipe(other)
+            request_account_deletion(user)
+            path = os.path.join(media_root, recipe.image.name)
+            self.assertTrue(os.path.exists(path))
+
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command(
+                    'delete_accounts', batch_size=2, stdout=StringIO())
+
+            self.assertFalse(os.path.exists(path))
+
+        self.assertFalse(type(user).objects.filter(pk=user.pk).exists())
+        self.assertEqual(list(Recipe.objects.all()), [kept])
+        self.assertEqual(Tag.objects.count(), 1)
+        self.assertEqual(Ingredient.objects.count(), 1)
+        self.assertEqual(RecipeIngredient.objects.count(), 1)
+        self.assertEqual(kept.tags.count(), 1)
 
-        patched_check.side_effect = [Psycopg2Error] * 2 + \
-            [OperationalError] * 3 + [True]
+    def test_active_accounts_not_deleted(self):
+        user = create_user()
+        self.create_recipe(user)
 
-        call_command('wait_for_db')
+        call_command('delete_accounts', stdout=StringIO())
 
-        self.assertEqual(patched_check.call_count, 6)
-        patched_check.assert_called_with(databases=['default'])
+        self.assertEqual(Recipe.objects.filter(user=user).count(), 1)
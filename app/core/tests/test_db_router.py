@@ -0,0 +1,109 @@
+"""
+Tests for the primary/replica database router
+"""
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core import db_router
+from core.checks import check_replica_cache
+from core.models import Tag
+from core.tests.helper import create_user
+
+TAG_URL = reverse('recipe:tag-list')
+RECIPES_URL = reverse('recipe:recipe-list')
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+REDIS = {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': 'redis://redis:6379/0',
+}
+
+
+@override_settings(DATABASE_REPLICAS=['replica0'])
+class RouterTests(TestCase):
+
+    def setUp(self):
+        self.router = db_router.PrimaryReplicaRouter()
+        self.addCleanup(db_router.disable_replica_reads)
+
+    def test_reads_use_primary_by_default(self):
+        self.assertEqual(self.router.db_for_read(Tag), 'default')
+
+    def test_reads_use_replica_when_enabled(self):
+        db_router.enable_replica_reads()
+        self.assertEqual(self.router.db_for_read(Tag), 'replica0')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_reads_use_primary_without_replicas(self):
+        db_router.enable_replica_reads()
+        self.assertEqual(self.router.db_for_read(Tag), 'default')
+
+    def test_writes_always_use_primary(self):
+        db_router.enable_replica_reads()
+        self.assertEqual(self.router.db_for_write(Tag), 'default')
+
+    def test_migrations_only_on_primary(self):
+        self.assertTrue(self.router.allow_migrate('default', 'core'))
+        self.assertFalse(self.router.allow_migrate('replica0', 'core'))
+
+
+class ReplicaReadMixinTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    @patch('core.db_router.enable_replica_reads')
+    def test_list_reads_from_replica(self, patched_enable):
+        self.client.get(TAG_URL)
+
+        patched_enable.assert_called_once()
+
+    @patch('core.db_router.enable_replica_reads')
+    def test_reads_after_write_stay_on_primary(self, patched_enable):
+        self.client.post(TAG_URL, {'name': 'Tag1'})
+        self.client.get(TAG_URL)
+
+        self.assertTrue(db_router.is_pinned_to_primary(self.user))
+        patched_enable.assert_not_called()
+
+    def test_failed_request_resets_replica_reads(self):
+        """ Test a request failing with 500 leaves reads on the primary. """
+        self.client.raise_request_exception = False
+
+        res = self.client.get(RECIPES_URL, {'tags': 'abc'})
+
+        self.assertEqual(res.status_code, 500)
+        self.assertFalse(db_router._state.use_replica)
+
+    def test_other_users_not_pinned(self):
+        other_user = create_user(email='other@example.com')
+        self.client.post(TAG_URL, {'name': 'Tag1'})
+
+        self.assertFalse(db_router.is_pinned_to_primary(other_user))
+
+
+class ReplicaCacheCheckTests(SimpleTestCase):
+
+    @override_settings(
+        DATABASE_REPLICAS=['replica0'], CACHES={'default': LOCMEM})
+    def test_replicas_with_local_cache_rejected(self):
+        errors = check_replica_cache(None)
+
+        self.assertEqual([error.id for error in errors], ['core.E001'])
+
+    @override_settings(
+        DATABASE_REPLICAS=['replica0'], CACHES={'default': REDIS})
+    def test_replicas_with_shared_cache_accepted(self):
+        self.assertEqual(check_replica_cache(None), [])
+
+    @override_settings(DATABASE_REPLICAS=[], CACHES={'default': LOCMEM})
+    def test_local_cache_without_replicas_accepted(self):
+        self.assertEqual(check_replica_cache(None), [])
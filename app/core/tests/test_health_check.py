@@ -1,10 +1,14 @@
 
-from django.test import TestCase
+import threading
+from unittest.mock import Mock, patch
 
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from core import health
+
 
 class HealthCheckTests(TestCase):
 
@@ -14,3 +18,81 @@ class HealthCheckTests(TestCase):
         res = client.get(url)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_health_check_get_only(self):
+        client = APIClient()
+        url = reverse('health-check')
+        res = client.post(url)
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+@override_settings(HEALTH_CHECK_TIMEOUT=0.2, HEALTH_CHECK_CACHE_SECONDS=5)
+class ReadinessCheckTests(TestCase):
+
+    def setUp(self):
+        health._last = None
+        self.client = APIClient()
+        self.url = reverse('health-check-ready')
+        self.checks = {name: Mock() for name in health.CHECKS}
+        patcher = patch.dict(health.CHECKS, self.checks)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_ready(self):
+        res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.json()['ready'])
+        self.assertEqual(set(res.json()['checks']), set(self.checks))
+        for check in res.json()['checks'].values():
+            self.assertTrue(check['ok'])
+            self.assertIn('ms', check)
+
+    def test_failing_dependency(self):
+        self.checks['cache'].side_effect = OSError('Connection refused')
+
+        with self.assertLogs('core.health', 'ERROR') as logs:
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(res.json()['ready'])
+        self.assertEqual(
+            res.json()['checks']['cache'],
+            {'ok': False, 'error': 'unavailable'},
+        )
+        self.assertNotIn('Connection refused', res.content.decode())
+        self.assertIn('Connection refused', logs.output[0])
+        self.assertTrue(res.json()['checks']['database']['ok'])
+
+    def test_slow_dependency_times_out(self):
+        released = threading.Event()
+        self.addCleanup(released.set)
+        self.checks['media'].side_effect = lambda: released.wait(5)
+
+        with self.assertLogs('core.health', 'WARNING'):
+            res = self.client.get(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(
+            res.json()['checks']['media'],
+            {'ok': False, 'error': 'timed out'},
+        )
+
+    def test_result_is_cached(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        self.checks['database'].assert_called_once()
+
+    @override_settings(HEALTH_CHECK_CACHE_SECONDS=0)
+    def test_cache_can_be_disabled(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        self.assertEqual(self.checks['database'].call_count, 2)
+
+    def test_readiness_check_get_only(self):
+        res = self.client.post(self.url)
+
+        self.assertEqual(res.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,59 @@
+"""
+Tests for the Prometheus metrics endpoint
+"""
+from django.test import TestCase
+from django.urls import reverse
+
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.tests.helper import create_user
+
+METRICS_URL = reverse('metrics')
+TAG_URL = reverse('recipe:tag-list')
+TOKEN_URL = reverse('user:token')
+
+
+class MetricsTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_request_latency_recorded_per_route(self):
+        user = create_user()
+        self.client.force_authenticate(user)
+        self.client.get(TAG_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        content = res.content.decode()
+        self.assertIn(
+            'api_request_latency_seconds_count'
+            '{method="GET",route="recipe:tag-list"}',
+            content,
+        )
+        self.assertIn('api_db_queries_bucket', content)
+        self.assertIn('api_response_size_bytes_bucket', content)
+
+    def test_failed_login_counted(self):
+        labels = {'reason': 'invalid_credentials'}
+        before = REGISTRY.get_sample_value(
+            'api_auth_failures_total', labels) or 0
+
+        self.client.post(
+            TOKEN_URL, {'email': 'none@example.com', 'password': 'bad'})
+
+        after = REGISTRY.get_sample_value('api_auth_failures_total', labels)
+        self.assertEqual(after, before + 1)
+
+    def test_unauthenticated_request_counted(self):
+        labels = {'reason': 'unauthenticated'}
+        before = REGISTRY.get_sample_value(
+            'api_auth_failures_total', labels) or 0
+
+        self.client.get(TAG_URL)
+
+        after = REGISTRY.get_sample_value('api_auth_failures_total', labels)
+        self.assertEqual(after, before + 1)
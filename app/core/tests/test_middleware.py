@@ -0,0 +1,107 @@
+"""
+Tests for the query instrumentation and compression middleware
+"""
+import gzip
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import Tag
+from core.queries import sql_shape
+from core.tests.helper import create_user
+
+TAG_URL = reverse('recipe:tag-list')
+
+
+class SqlShapeTests(SimpleTestCase):
+
+    def test_shape_ignores_literals(self):
+        self.assertEqual(
+            sql_shape("SELECT * FROM t WHERE id = 1 AND name = 'a'"),
+            sql_shape("SELECT * FROM t WHERE id = 22 AND name = 'b'"),
+        )
+
+    def test_shape_collapses_in_lists(self):
+        self.assertEqual(
+            sql_shape('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            'SELECT * FROM t WHERE id IN (...)',
+        )
+
+
+class QueryInstrumentationMiddlewareTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+
+    def test_disabled_by_default(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        res = client.get(TAG_URL)
+
+        self.assertNotIn('Server-Timing', res)
+
+    @override_settings(QUERY_INSTRUMENTATION=True)
+    def test_server_timing_header(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with self.assertLogs('core.middleware', level='INFO') as logs:
+            res = client.get(TAG_URL)
+
+        self.assertIn('db;dur=', res['Server-Timing'])
+        self.assertIn('view;dur=', res['Server-Timing'])
+        self.assertIn('view=TagViewSet action=list', logs.output[0])
+
+    @override_settings(
+        QUERY_INSTRUMENTATION=True,
+        QUERY_INSTRUMENTATION_REPEAT_THRESHOLD=2,
+    )
+    def test_repeated_queries_flagged(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        payload = {'title': 'Recipe', 'time_minutes': 5,
+                   'tags': [{'name': f'Tag{i}'} for i in range(4)]}
+
+        with self.assertLogs('core.middleware', level='INFO') as logs:
+            client.post(
+                reverse('recipe:recipe-list'), payload, format='json')
+
+        self.assertEqual(Tag.objects.count(), 4)
+        self.assertTrue(any(
+            'repeated query view=RecipeViewSet action=create' in line
+            for line in logs.output
+        ))
+
+
+class GZipMiddlewareTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        for i in range(30):
+            Tag.objects.create(user=self.user, name=f'Tag {i}')
+
+    def get(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client.get(TAG_URL, HTTP_ACCEPT_ENCODING='gzip')
+
+    def test_disabled_by_default(self):
+        res = self.get()
+
+        self.assertFalse(res.has_header('Content-Encoding'))
+
+    @override_settings(GZIP_RESPONSES=True, GZIP_MIN_LENGTH=100)
+    def test_large_response_compressed(self):
+        res = self.get()
+
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', res['Vary'])
+        self.assertIn(b'Tag 29', gzip.decompress(res.content))
+
+    @override_settings(GZIP_RESPONSES=True, GZIP_MIN_LENGTH=100000)
+    def test_small_response_not_compressed(self):
+        res = self.get()
+
+        self.assertFalse(res.has_header('Content-Encoding'))
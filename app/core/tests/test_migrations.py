@@ -0,0 +1,78 @@
+"""
+Tests for the raw SQL migrations
+
+The test database is built from the models, so these migrations would
+otherwise never run in the tests.
+"""
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from core.models import User
+
+BEFORE = [('core', '0009_user_deletion_requested')]
+AFTER = [('core', '0011_user_email_lower_uniq')]
+
+INDEXES = {
+    'core_recipe': 'core_recipe_title_upper_idx',
+    'core_tag': 'core_tag_name_upper_idx',
+    'core_ingredient': 'core_ingredient_name_upper_idx',
+    'core_user': 'core_user_email_lower_uniq',
+}
+
+
+def migrate(targets):
+    executor = MigrationExecutor(connection)
+    executor.migrate(targets)
+
+
+def constraints(table):
+    with connection.cursor() as cursor:
+        return connection.introspection.get_constraints(cursor, table)
+
+
+class RawSQLMigrationTests(TransactionTestCase):
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        recorder = executor.recorder
+        applied = set(recorder.applied_migrations())
+
+        # The schema matches the latest migrations, so record them as
+        # applied before migrating back.
+        leaves = executor.loader.graph.leaf_nodes()
+        for key in executor.loader.graph.nodes:
+            if key not in applied:
+                recorder.record_applied(*key)
+        migrate(BEFORE)
+
+        def restore():
+            migrate(leaves)
+            for key in set(recorder.applied_migrations()) - applied:
+                recorder.record_unapplied(*key)
+
+        self.addCleanup(restore)
+
+    def test_indexes_created(self):
+        for table, name in INDEXES.items():
+            self.assertNotIn(name, constraints(table))
+
+        migrate(AFTER)
+
+        for table, name in INDEXES.items():
+            with self.subTest(index=name):
+                self.assertIn(name, constraints(table))
+        email_index = constraints('core_user')[INDEXES['core_user']]
+        self.assertTrue(email_index['unique'])
+
+    def test_emails_differing_in_case_reported(self):
+        first = User.objects.create(email='Test@example.com')
+        second = User.objects.create(email='test@example.com')
+
+        with self.assertRaisesRegex(RuntimeError, 'differ in case') as cm:
+            migrate(AFTER)
+
+        message = str(cm.exception)
+        self.assertIn(f'user {first.pk} <Test@example.com>', message)
+        self.assertIn(f'user {second.pk} <test@example.com>', message)
+        User.objects.all().delete()
@@ -0,0 +1,59 @@
+"""
+Tests for the query budget test utility
+"""
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import Tag
+from core.tests.helper import create_user
+from core.tests.query_budget import query_budget
+
+TAG_URL = reverse('recipe:tag-list')
+
+
+class QueryBudgetTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(create_user())
+
+    @patch('core.tests.query_budget.load_budgets')
+    def test_call_over_budget_fails(self, patched_budgets):
+        patched_budgets.return_value = {'GET recipe:tag-list': {'queries': 0}}
+
+        @query_budget
+        def call_api():
+            self.client.get(TAG_URL)
+
+        with self.assertRaisesRegex(AssertionError, 'budget is 0'):
+            call_api()
+
+    @patch('core.tests.query_budget.load_budgets')
+    def test_call_without_budget_fails(self, patched_budgets):
+        patched_budgets.return_value = {}
+
+        @query_budget
+        def call_api():
+            self.client.get(TAG_URL)
+
+        with self.assertRaisesRegex(AssertionError, 'has no query budget'):
+            call_api()
+
+    @patch('core.tests.query_budget.load_budgets')
+    def test_budget_scales_with_items(self, patched_budgets):
+        patched_budgets.return_value = {
+            'GET recipe:tag-list': {'queries': 0, 'per_item': 1},
+        }
+        user = create_user(email='other@example.com')
+        self.client.force_authenticate(user)
+        Tag.objects.create(user=user, name='Tag1')
+
+        @query_budget
+        def call_api():
+            return self.client.get(TAG_URL)
+
+        self.assertEqual(len(call_api().data), 1)
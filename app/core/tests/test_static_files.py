@@ -0,0 +1,117 @@
+"""
+Tests for the collected static files
+"""
+import json
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.storage import CompressedManifestStaticFilesStorage
+from core.tests.helper import create_user
+
+STATIC_REFERENCE = re.compile(
+    r'(?:src|href)="' + re.escape(settings.STATIC_URL) + r'([^"?#]+)')
+CSS_URL = re.compile(r'url\(\s*["\']?(?!data:|https?:|#)([^"\')?#]+)')
+
+
+class ManifestStaticFilesTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        cls.settings = override_settings(
+            STATIC_ROOT=cls.static_root,
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'),
+        )
+        cls.settings.enable()
+        cls.addClassCleanup(cls.settings.disable)
+
+        call_command('collectstatic', interactive=False, stdout=StringIO())
+
+        with open(os.path.join(cls.static_root, 'staticfiles.json')) as f:
+            cls.manifest = json.load(f)['paths']
+
+    def setUp(self):
+        self.user = create_user(email='admin@example.com')
+        self.user.is_staff = True
+        self.user.is_superuser = True
+        self.user.save()
+        self.client.force_login(self.user)
+
+    def assertCollected(self, name, referenced_by):
+        path = os.path.join(self.static_root, name)
+        self.assertTrue(
+            os.path.exists(path),
+            f'{name} referenced by {referenced_by} was not collected',
+        )
+
+    def test_manifest_covers_every_static_file(self):
+        found = {
+            path.replace(os.sep, '/')
+            for finder in finders.get_finders()
+            for path, storage in finder.list(ignore_patterns=None)
+        }
+
+        self.assertEqual(found - set(self.manifest), set())
+
+    def test_pages_reference_hashed_assets(self):
+        pages = [
+            reverse('admin:index'),
+            reverse('admin:core_recipe_changelist'),
+            reverse('admin:core_recipe_add'),
+        ]
+        hashed = set(self.manifest.values())
+        for url in pages:
+            with self.subTest(url=url):
+                res = self.client.get(url)
+                names = STATIC_REFERENCE.findall(res.content.decode())
+
+                self.assertTrue(names)
+                for name in names:
+                    self.assertIn(name, hashed)
+                    self.assertCollected(name, url)
+
+    def test_stylesheet_references_collected(self):
+        for name in self.manifest.values():
+            if not name.endswith('.css'):
+                continue
+            with open(os.path.join(self.static_root, name)) as f:
+                urls = CSS_URL.findall(f.read())
+            for url in urls:
+                target = posixpath.normpath(
+                    posixpath.join(posixpath.dirname(name), url))
+                self.assertCollected(target, name)
+
+    def test_compressed_copies_written(self):
+        name = self.manifest['admin/css/base.css']
+        path = os.path.join(self.static_root, name)
+
+        self.assertTrue(os.path.exists(f'{path}.gz'))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.static_root, 'admin/css/base.css.gz')))
+
+
+class ManifestFallbackTests(TestCase):
+
+    def test_plain_names_without_manifest(self):
+        """ Test names are served unhashed before collectstatic ran. """
+        with tempfile.TemporaryDirectory() as static_root:
+            storage = CompressedManifestStaticFilesStorage(
+                location=static_root)
+
+            self.assertEqual(
+                storage.url('admin/css/base.css'),
+                f'{settings.STATIC_URL}admin/css/base.css',
+            )
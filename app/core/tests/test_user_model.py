@@ -1,6 +1,12 @@
+from importlib import import_module
+
+from django.apps import apps
 from django.test import TestCase
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+
+email_migration = import_module('core.migrations.0011_user_email_lower_uniq')
 
 
 class UserModelTests(TestCase):
@@ -71,3 +77,38 @@ class UserModelTests(TestCase):
 
         self.assertTrue(user.is_superuser)
         self.assertTrue(user.is_staff)
+
+    def test_email_unique_ignoring_case(self):
+        get_user_model().objects.create_user('test@example.com', 'sample123')
+
+        with self.assertRaises(IntegrityError):
+            get_user_model().objects.create_user(
+                'Test@example.com', 'sample123')
+
+    def test_get_by_natural_key_ignores_case(self):
+        user = get_user_model().objects.create_user(
+            'Test@example.com', 'sample123')
+
+        found = get_user_model().objects.get_by_natural_key(
+            'test@EXAMPLE.com')
+
+        self.assertEqual(found, user)
+
+    def test_migration_reports_conflicting_emails(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX core_user_email_lower_uniq')
+        first = get_user_model().objects.create_user(
+            'test@example.com', 'sample123')
+        second = get_user_model().objects.create_user(
+            'TEST@example.com', 'sample123')
+        get_user_model().objects.create_user('other@example.com', 'sample123')
+
+        with connection.schema_editor() as schema_editor:
+            with self.assertRaisesRegex(RuntimeError, 'Found 1 pairs') as cm:
+                email_migration.report_conflicts(apps, schema_editor)
+
+        self.assertIn(
+            f'user {first.id} <test@example.com> and '
+            f'user {second.id} <TEST@example.com>',
+            str(cm.exception),
+        )
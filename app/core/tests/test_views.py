@@ -0,0 +1,103 @@
+"""
+Tests for the core views
+"""
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.schema import CachedSchemaView, generate_schema, schema_url
+from core.views import lazy_view
+
+
+class LazyViewTests(SimpleTestCase):
+
+    @patch('core.views.import_string')
+    def test_view_imported_on_first_request(self, patched_import):
+        view_class = patched_import.return_value
+        view = lazy_view('app.views.SomeView', url_name='api-schema')
+        patched_import.assert_not_called()
+
+        request = RequestFactory().get('/')
+        view(request)
+        view(request)
+
+        patched_import.assert_called_once_with('app.views.SomeView')
+        view_class.as_view.assert_called_once_with(url_name='api-schema')
+        self.assertEqual(view_class.as_view.return_value.call_count, 2)
+
+    def test_view_is_csrf_exempt(self):
+        self.assertTrue(lazy_view('app.views.SomeView').csrf_exempt)
+
+
+class SchemaViewTests(SimpleTestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        CachedSchemaView.rendered.clear()
+        schema_url.cache_clear()
+        self.addCleanup(schema_url.cache_clear)
+
+    def test_schema(self):
+        res = self.client.get(reverse('api-schema'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(b'/api/recipe/recipes/', res.content)
+        self.assertIn('Accept-Encoding', res['Vary'])
+
+    def test_schema_generated_once(self):
+        with patch.object(
+            SchemaGenerator, 'get_schema',
+            autospec=True, side_effect=SchemaGenerator.get_schema,
+        ) as patched_get:
+            first = self.client.get(reverse('api-schema'))
+            second = self.client.get(reverse('api-schema'))
+
+        self.assertEqual(patched_get.call_count, 1)
+        self.assertEqual(first.content, second.content)
+
+    def test_schema_compressed(self):
+        plain = self.client.get(reverse('api-schema'), {'format': 'json'})
+        res = self.client.get(
+            reverse('api-schema'), {'format': 'json'},
+            HTTP_ACCEPT_ENCODING='gzip, deflate',
+        )
+
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(res.content), plain.content)
+        self.assertEqual(
+            json.loads(plain.content)['paths'].keys(),
+            json.loads(generate_schema())['paths'].keys(),
+        )
+
+    def test_docs(self):
+        res = self.client.get(reverse('api-docs'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertContains(res, reverse('api-schema'))
+
+    def test_docs_use_prebuilt_schema(self):
+        with tempfile.TemporaryDirectory() as static_root:
+            with override_settings(STATIC_ROOT=static_root):
+                call_command('build_schema', stdout=StringIO())
+                res = self.client.get(reverse('api-docs'))
+
+            directory = os.path.join(static_root, 'schema')
+            with open(os.path.join(directory, 'manifest.json')) as f:
+                name = json.load(f)['openapi.json']
+            with open(os.path.join(directory, name), 'rb') as f:
+                self.assertEqual(f.read(), generate_schema())
+            self.assertTrue(os.path.exists(
+                os.path.join(directory, f'{name}.gz')))
+
+        self.assertContains(res, f'{settings.STATIC_URL}schema/{name}')
@@ -1,7 +1,51 @@
-from rest_framework.decorators import api_view
-from rest_framework.response import Response
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseNotAllowed, JsonResponse
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
+from prometheus_client import CONTENT_TYPE_LATEST
 
+from core import metrics
+from core.health import readiness
 
-@api_view(['GET'])
-def health_check(request):
-    return Response({'health': True})
+
+async def health_check(request):
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    return JsonResponse({'health': True})
+
+
+async def readiness_check(request):
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    # The checks block, so they run off the event loop and off the
+    # thread serving sync views.
+    checks = await sync_to_async(readiness, thread_sensitive=False)()
+    ready = all(check['ok'] for check in checks.values())
+    return JsonResponse(
+        {'ready': ready, 'checks': checks},
+        status=200 if ready else 503,
+    )
+
+
+def metrics_view(request):
+    return HttpResponse(metrics.collect(), content_type=CONTENT_TYPE_LATEST)
+
+
+def lazy_view(view_class, **initkwargs):
+    """ Return a view importing view_class on its first request.
+
+    For rarely used views whose modules would otherwise be imported by
+    every worker.
+    """
+    view = None
+
+    @csrf_exempt
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_class).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return wrapper
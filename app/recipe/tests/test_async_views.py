@@ -0,0 +1,98 @@
+"""
+Tests for the async list views
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory, TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import db_router
+from core.async_views import async_list_view
+from core.models import AuthToken, Ingredient, Recipe, Tag
+from core.tests.helper import create_user
+from recipe import views
+
+LIST_ACTIONS = {'get': 'list', 'post': 'create'}
+
+
+class AsyncListViewTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        self.token = AuthToken.objects.create(user=self.user)
+        # AsyncRequestFactory takes raw header names.
+        self.auth = {'authorization': f'Token {self.token.key}'}
+        self.factory = AsyncRequestFactory()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        other = create_user(email='other@example.com')
+        Tag.objects.create(user=other, name='Other')
+        self.tag = Tag.objects.create(user=self.user, name='Dinner')
+        Tag.objects.create(user=self.user, name='Breakfast')
+        Ingredient.objects.create(user=self.user, name='Salt')
+        recipe = Recipe.objects.create(
+            user=self.user, title='Soup', time_minutes=5)
+        recipe.tags.add(self.tag)
+        Recipe.objects.create(user=self.user, title='Toast', time_minutes=2)
+
+    async def get(self, viewset, path, data=None, **extra):
+        view = async_list_view(viewset, LIST_ACTIONS)
+        request = self.factory.get(path, data, **self.auth, **extra)
+        return await view(request)
+
+    async def test_lists_match_sync_views(self):
+        cases = [
+            (views.TagViewSet, reverse('recipe:tag-list'), None),
+            (views.IngredientViewSet, reverse('recipe:ingredient-list'), None),
+            (views.RecipeViewSet, reverse('recipe:recipe-list'), None),
+            (
+                views.RecipeViewSet,
+                reverse('recipe:recipe-list'),
+                {'tags': str(self.tag.id)},
+            ),
+        ]
+        for viewset, path, params in cases:
+            with self.subTest(path=path, params=params):
+                res = await self.get(viewset, path, params)
+                expected = await self.sync_get(path, params)
+
+                self.assertEqual(res.status_code, status.HTTP_200_OK)
+                self.assertEqual(json.loads(res.content), expected)
+
+    async def sync_get(self, path, params):
+        res = await sync_to_async(self.client.get)(path, params)
+        return json.loads(res.content)
+
+    async def test_list_requires_authentication(self):
+        self.auth = {}
+
+        res = await self.get(views.TagViewSet, reverse('recipe:tag-list'))
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('WWW-Authenticate', res)
+
+    async def test_post_goes_to_sync_view(self):
+        view = async_list_view(views.TagViewSet, LIST_ACTIONS)
+        request = self.factory.post(
+            reverse('recipe:tag-list'), {'name': 'Lunch'},
+            content_type='application/json', **self.auth)
+
+        res = await view(request)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    async def test_failed_request_resets_replica_reads(self):
+        """ Test an unhandled error leaves reads on the primary. """
+        with self.assertRaises(ValueError):
+            await self.get(
+                views.RecipeViewSet, reverse('recipe:recipe-list'),
+                {'tags': 'abc'})
+
+        use_replica = await sync_to_async(
+            lambda: db_router._state.use_replica)()
+        self.assertFalse(use_replica)
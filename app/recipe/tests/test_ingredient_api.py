@@ -5,6 +5,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from core.models import Ingredient
 from core.tests.helper import create_user
+from core.tests.query_budget import query_budget
 
 INGREDIENT_URL = reverse('recipe:ingredient-list')
 
@@ -17,6 +18,7 @@ def create_ingredient(user, name='Ingredient1'):
     return Ingredient.objects.create(user=user, name=name)
 
 
+@query_budget
 class UnauthenticatedIngredientAPITests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -51,6 +53,7 @@ class UnauthenticatedIngredientAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@query_budget
 class AuthenticatedIngredientAPITests(TestCase):
     def setUp(self):
         self.user = create_user()
@@ -15,14 +15,20 @@ from core.models import (
     Ingredient,
     RecipeIngredient,
 )
+from core.tests.query_budget import query_budget
 
 RECIPES_URL = reverse('recipe:recipe-list')
+BULK_DELETE_URL = reverse('recipe:recipe-bulk-delete')
 
 
 def detail_url(recipe_id):
     return reverse('recipe:recipe-detail', args=[recipe_id])
 
 
+def duplicate_url(recipe_id):
+    return reverse('recipe:recipe-duplicate', args=[recipe_id])
+
+
 def image_upload_url(recipe_id):
     return reverse('recipe:recipe-upload-image', args=[recipe_id])
 
@@ -44,6 +50,7 @@ def create_user(**params):
     return get_user_model().objects.create_user(**params)
 
 
+@query_budget
 class UnauthenticatedRecipeAPITests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -62,6 +69,7 @@ class UnauthenticatedRecipeAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@query_budget
 class AuthenticatedRecipeAPITests(TestCase):
 
     def setUp(self):
@@ -85,6 +93,16 @@ class AuthenticatedRecipeAPITests(TestCase):
         self.assertIn('time_minutes', keys)
         self.assertNotIn('description', keys)
 
+    def test_list_queries_do_not_grow_with_recipes(self):
+        for i in range(10):
+            recipe = create_recipe(self.user, title=f'Recipe {i}')
+            recipe.tags.add(Tag.objects.create(user=self.user, name=f'T{i}'))
+
+        res = self.client.get(RECIPES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 10)
+
     def test_list_recipes_ordered_by_id_desc(self):
         recipe_values = [
             {'title': 'Recipe 1', 'description': 'Text 1', 'time_minutes': 5},
@@ -202,6 +220,96 @@ class AuthenticatedRecipeAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Recipe.objects.filter(id=recipe.id).exists())
 
+    def test_delete_removes_tag_links_and_ingredients(self):
+        recipe = create_recipe(user=self.user)
+        tag = Tag.objects.create(user=self.user, name='Dinner')
+        ingredient = Ingredient.objects.create(user=self.user, name='Salt')
+        recipe.tags.add(tag)
+        RecipeIngredient.objects.create(
+            recipe=recipe, ingredient=ingredient, quantity=1)
+
+        res = self.client.delete(detail_url(recipe_id=recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(RecipeIngredient.objects.exists())
+        self.assertFalse(Recipe.tags.through.objects.exists())
+        self.assertTrue(Tag.objects.filter(id=tag.id).exists())
+        self.assertTrue(Ingredient.objects.filter(id=ingredient.id).exists())
+
+    def test_delete_other_user_recipe_fails(self):
+        other_user = create_user(
+            email='other@example.com',
+            password='otherpass123',
+        )
+        recipe = create_recipe(user=other_user)
+
+        res = self.client.delete(detail_url(recipe_id=recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Recipe.objects.filter(id=recipe.id).exists())
+
+    def test_duplicate_recipe(self):
+        """ Test duplicating copies the recipe, tags and ingredients. """
+        recipe = create_recipe(user=self.user, link='https://example.com')
+        tag = Tag.objects.create(user=self.user, name='Dinner')
+        ingredient = Ingredient.objects.create(user=self.user, name='Salt')
+        recipe.tags.add(tag)
+        RecipeIngredient.objects.create(
+            recipe=recipe, ingredient=ingredient, quantity=2, units='tsp')
+
+        res = self.client.post(duplicate_url(recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        copy = Recipe.objects.get(id=res.data['id'])
+        self.assertNotEqual(copy.id, recipe.id)
+        self.assertEqual(copy.user, self.user)
+        for field in ['title', 'description', 'time_minutes', 'rating',
+                      'link']:
+            self.assertEqual(getattr(copy, field), getattr(recipe, field))
+        self.assertEqual(list(copy.tags.all()), [tag])
+        copied = copy.recipe_ingredients.get()
+        self.assertEqual(copied.ingredient, ingredient)
+        self.assertEqual((copied.quantity, copied.units), (2, 'tsp'))
+        self.assertEqual(recipe.recipe_ingredients.count(), 1)
+
+    def test_duplicate_other_user_recipe_fails(self):
+        other_user = create_user(
+            email='other@example.com',
+            password='otherpass123',
+        )
+        recipe = create_recipe(user=other_user)
+
+        res = self.client.post(duplicate_url(recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Recipe.objects.count(), 1)
+
+    def test_bulk_delete(self):
+        """ Test deleting many recipes, skipping other users' ones. """
+        other_user = create_user(
+            email='other@example.com',
+            password='otherpass123',
+        )
+        recipes = [create_recipe(user=self.user) for _ in range(3)]
+        kept = create_recipe(user=self.user)
+        other = create_recipe(user=other_user)
+        ids = [recipe.id for recipe in recipes] + [other.id]
+
+        res = self.client.post(BULK_DELETE_URL, {'ids': ids}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data['deleted'], sorted(recipe.id for recipe in recipes))
+        self.assertEqual(
+            set(Recipe.objects.values_list('id', flat=True)),
+            {kept.id, other.id},
+        )
+
+    def test_bulk_delete_requires_ids(self):
+        res = self.client.post(BULK_DELETE_URL, {'ids': []}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_get_other_user_recipe_fails(self):
         other_user = create_user(
             email='other@example.com',
@@ -380,6 +488,7 @@ class AuthenticatedRecipeAPITests(TestCase):
         # self.assertEqual(res.data[0]['recipe_ingredients'][0].values(), 2)
 
 
+@query_budget
 class ImageUploadTests(TestCase):
 
     def setUp(self):
@@ -420,6 +529,44 @@ class ImageUploadTests(TestCase):
         self.assertTrue(res.data['image'].startswith(
             'http://testserver/static/media/uploads/recipe/'))
 
+    def test_delete_removes_image(self):
+        """ Test the image file is removed once the delete commits. """
+        url = image_upload_url(self.recipe.id)
+        with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
+            img = Image.new('RGB', (10, 10))
+            img.save(image_file, format='JPEG')
+            image_file.seek(0)
+            self.client.post(url, {'image': image_file}, format='multipart')
+        self.recipe.refresh_from_db()
+        path = self.recipe.image.path
+        self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.delete(detail_url(recipe_id=self.recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(os.path.exists(path))
+
+    def test_duplicate_shares_image(self):
+        """ Test a copy shares the image, which outlives deleting one of
+        the two recipes. """
+        url = image_upload_url(self.recipe.id)
+        with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
+            img = Image.new('RGB', (10, 10))
+            img.save(image_file, format='JPEG')
+            image_file.seek(0)
+            self.client.post(url, {'image': image_file}, format='multipart')
+        self.recipe.refresh_from_db()
+
+        res = self.client.post(duplicate_url(self.recipe.id))
+        copy = Recipe.objects.get(id=res.data['id'])
+        self.assertEqual(copy.image.name, self.recipe.image.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(detail_url(recipe_id=copy.id))
+
+        self.assertTrue(os.path.exists(self.recipe.image.path))
+
     def test_upload_image_bad_request(self):
         url = image_upload_url(self.recipe.id)
 
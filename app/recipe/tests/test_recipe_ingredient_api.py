@@ -5,6 +5,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from core.models import Recipe, Ingredient, RecipeIngredient
 from core.tests.helper import create_user
+from core.tests.query_budget import query_budget
 
 
 def recipe_ingredient_url(recipe_id):
@@ -44,6 +45,7 @@ def create_ingredient(user, name='Ingredient1'):
     return Ingredient.objects.create(user=user, name=name)
 
 
+@query_budget
 class UnauthenticatedRecipeIngredientAPITests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -55,6 +57,7 @@ class UnauthenticatedRecipeIngredientAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@query_budget
 class AuthenticatedRecipeIngredientAPITests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -75,6 +78,19 @@ class AuthenticatedRecipeIngredientAPITests(TestCase):
         self.assertEqual(res.data['recipe'], recipe.id)
         self.assertEqual(res.data['ingredient']['name'], ingredient.name)
 
+    def test_list_recipe_ingredients(self):
+        recipe = create_recipe(self.user)
+        for i in range(5):
+            create_recipe_ingredient(
+                recipe=recipe,
+                ingredient=create_ingredient(self.user, f'Ingredient{i}'),
+            )
+
+        res = self.client.get(recipe_ingredient_url(recipe.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 5)
+
     def test_create_recipe_ingredient(self):
         recipe = create_recipe(self.user)
 
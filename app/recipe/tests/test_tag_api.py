@@ -5,6 +5,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 from core.models import Tag, Recipe
 from core.tests.helper import create_user
+from core.tests.query_budget import query_budget
 
 TAG_URL = reverse('recipe:tag-list')
 
@@ -17,6 +18,7 @@ def create_tag(user, name='Tag1'):
     return Tag.objects.create(user=user, name=name)
 
 
+@query_budget
 class UnauthenticatedTagAPITests(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -51,6 +53,7 @@ class UnauthenticatedTagAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@query_budget
 class AuthenticatedTagAPITests(TestCase):
     def setUp(self):
         self.user = create_user()
@@ -1,6 +1,7 @@
 """"
 URL mappings for the recipe API
 """
+from django.conf import settings
 from django.urls import (
     path,
     include,
@@ -9,6 +10,8 @@ from rest_framework.routers import DefaultRouter
 from recipe import views
 from rest_framework_nested import routers
 
+from core.async_views import async_list_view
+
 
 router = DefaultRouter()
 router.register('recipes', views.RecipeViewSet)
@@ -33,3 +36,24 @@ urlpatterns = [
     path('', include(router.urls)),
     path('', include(recipe_ingredients_router.urls))
 ]
+
+if settings.ASYNC_VIEWS:
+    # Matched before the router, which keeps serving every other action.
+    list_actions = {'get': 'list', 'post': 'create'}
+    urlpatterns = [
+        path(
+            'recipes/',
+            async_list_view(views.RecipeViewSet, list_actions),
+            name='recipe-list',
+        ),
+        path(
+            'tags/',
+            async_list_view(views.TagViewSet, list_actions),
+            name='tag-list',
+        ),
+        path(
+            'ingredients/',
+            async_list_view(views.IngredientViewSet, list_actions),
+            name='ingredient-list',
+        ),
+    ] + urlpatterns
@@ -5,14 +5,13 @@ from drf_spectacular.utils import (
     OpenApiTypes,
 )
 
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.authentication import TokenAuthentication
+from django.http import Http404
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework import (
     viewsets,
     mixins,
     status,
 )
-
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
@@ -23,13 +22,50 @@ from recipe.serializers import (
     IngredientSerializer,
     RecipeIngredientSerializer,
     RecipeImageSerializer,
+    RecipeBulkDeleteSerializer,
 )
+from core import db_router, metrics
+from core.deletion import delete_recipes
 from core.models import (
     Recipe,
     Tag,
     Ingredient,
     RecipeIngredient,
 )
+from user.authentication import (
+    ExpiringTokenAuthentication,
+    SignedAccessTokenAuthentication,
+)
+
+
+class ReplicaReadMixin:
+    """ Serve safe requests from a read replica.
+
+    Users who wrote recently keep reading from the primary so they
+    always see their own changes.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # finalize_response is skipped when handle_exception re-raises,
+            # and the flag must not outlive the request on this thread.
+            db_router.disable_replica_reads()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and \
+                not db_router.is_pinned_to_primary(request.user):
+            db_router.enable_replica_reads()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        db_router.disable_replica_reads()
+        if request.method not in SAFE_METHODS and \
+                request.user.is_authenticated:
+            db_router.pin_to_primary(request.user)
+
+        return super().finalize_response(request, response, *args, **kwargs)
 
 
 @extend_schema_view(
@@ -48,11 +84,14 @@ from core.models import (
         ]
     )
 )
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """ View for managing recipe APIs"""
     serializer_class = RecipeDetailSerializer
-    queryset = Recipe.objects.prefetch_related('recipe_ingredients')
-    authentication_classes = [TokenAuthentication]
+    queryset = Recipe.objects.all()
+    authentication_classes = [
+        SignedAccessTokenAuthentication,
+        ExpiringTokenAuthentication,
+    ]
     permission_classes = [IsAuthenticated]
 
     def _params_to_ints(self, qs):
@@ -63,6 +102,11 @@ class RecipeViewSet(viewsets.ModelViewSet):
         tags = self.request.query_params.get('tags')
         ingredients = self.request.query_params.get('ingredients')
         queryset = self.queryset
+        if self.action == 'list':
+            queryset = queryset.prefetch_related('tags')
+        elif self.action in ('retrieve', 'update', 'partial_update'):
+            queryset = queryset.prefetch_related(
+                'tags', 'recipe_ingredients__ingredient')
 
         if tags:
             tag_ids = self._params_to_ints(tags)
@@ -82,12 +126,47 @@ class RecipeViewSet(viewsets.ModelViewSet):
             return RecipeSerializer
         elif self.action == 'upload_image':
             return RecipeImageSerializer
+        elif self.action == 'bulk_delete':
+            return RecipeBulkDeleteSerializer
 
         return self.serializer_class
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def destroy(self, request, *args, **kwargs):
+        # Ownership is part of the DELETE, so no lookup is needed first.
+        try:
+            pk = int(kwargs['pk'])
+        except ValueError:
+            raise Http404
+        if not delete_recipes(request.user, [pk]):
+            raise Http404
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(request=None, responses={201: RecipeDetailSerializer})
+    @action(methods=['POST'], detail=True)
+    def duplicate(self, request, pk=None):
+        """ Copy a recipe with its tags and ingredients. """
+        copy_pk = self.get_object().duplicate()
+        copy = self.get_queryset().prefetch_related(
+            'tags', 'recipe_ingredients__ingredient').get(pk=copy_pk)
+        serializer = RecipeDetailSerializer(
+            copy, context=self.get_serializer_context())
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(methods=['POST'], detail=False, url_path='bulk-delete')
+    def bulk_delete(self, request):
+        """ Delete many recipes by id. Ids of other users are ignored. """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        deleted = delete_recipes(
+            request.user, set(serializer.validated_data['ids']))
+
+        return Response({'deleted': sorted(deleted)})
+
     @action(methods=['POST'], detail=True, url_path='upload-image')
     def upload_image(self, request, pk=None):
         recipe = self.get_object()
@@ -95,12 +174,14 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
         if serializer.is_valid():
             serializer.save()
+            metrics.IMAGE_UPLOADS.inc()
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class BaseRecipeAttrViewSet(
+        ReplicaReadMixin,
         mixins.ListModelMixin,
         mixins.UpdateModelMixin,
         mixins.DestroyModelMixin,
@@ -109,7 +190,10 @@ class BaseRecipeAttrViewSet(
         viewsets.GenericViewSet):
 
     permission_classes = [IsAuthenticated]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [
+        SignedAccessTokenAuthentication,
+        ExpiringTokenAuthentication,
+    ]
 
     def get_queryset(self):
         return self.queryset.filter(user=self.request.user).order_by('-name')
@@ -167,7 +251,8 @@ class RecipeIngredientViewSet(BaseRecipeAttrViewSet):
 
     def get_queryset(self):
         return self.queryset.filter(
-            recipe__user=self.request.user).order_by('ingredient')
+            recipe__user=self.request.user,
+        ).select_related('ingredient').order_by('ingredient')
 
     def perform_create(self, serializer):
         serializer.save()
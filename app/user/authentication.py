@@ -0,0 +1,121 @@
+"""
+Authentication classes for the API
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    BaseAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.permissions import SAFE_METHODS
+
+from core.models import AuthToken
+
+ACCESS_TOKEN_SALT = 'user.access-token'
+
+
+class ExpiringTokenAuthentication(TokenAuthentication):
+    """ Token authentication rejecting expired tokens.
+
+    Expiry is checked on the row loaded with the user, so rejecting a
+    token costs no extra query. Tokens in use slide forward, at most once
+    per AUTH_TOKEN_RENEW_INTERVAL. Tokens issued before the user's
+    tokens were revoked are rejected.
+    """
+    model = AuthToken
+
+    def authenticate_credentials(self, key):
+        user, token = super().authenticate_credentials(key)
+
+        now = timezone.now()
+        if token.expires <= now:
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+        if token.is_revoked:
+            raise exceptions.AuthenticationFailed(_('Token has been revoked.'))
+
+        renewed = token.expires - timedelta(seconds=settings.AUTH_TOKEN_TTL)
+        if now - renewed >= timedelta(
+                seconds=settings.AUTH_TOKEN_RENEW_INTERVAL):
+            token.expires = now + timedelta(seconds=settings.AUTH_TOKEN_TTL)
+            AuthToken.objects.filter(pk=token.pk).update(
+                expires=token.expires)
+
+        return user, token
+
+
+class AccessToken(dict):
+    """ Claims of a verified signed access token. """
+
+
+def issue_access_token(user):
+    """ Return a signed access token for the user. """
+    return signing.dumps(
+        {'uid': user.pk, 'ver': user.token_version},
+        salt=ACCESS_TOKEN_SALT,
+    )
+
+
+class SignedAccessTokenAuthentication(BaseAuthentication):
+    """ Authentication with short-lived signed access tokens.
+
+        Authorization: Bearer <access token>
+
+    Reads check the token's signature and age only, so no query is made.
+    request.user is then an unsaved User carrying just the primary key;
+    views needing the other fields load them with refresh_from_db(). Until
+    the token expires, reads keep working after the user's tokens were
+    revoked or the account was deleted.
+
+    Writes load the user and reject tokens of deleted, deactivated or
+    revoked accounts straight away.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        if not settings.SIGNED_ACCESS_TOKENS:
+            return None
+
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            msg = _('Invalid token header.')
+            raise exceptions.AuthenticationFailed(msg)
+
+        try:
+            claims = signing.loads(
+                auth[1].decode(),
+                salt=ACCESS_TOKEN_SALT,
+                max_age=settings.SIGNED_ACCESS_TOKEN_TTL,
+            )
+        except signing.SignatureExpired:
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+        except (signing.BadSignature, UnicodeError):
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if request.method not in SAFE_METHODS:
+            return self.authenticate_write(claims)
+
+        user = get_user_model()(pk=claims['uid'])
+        user._state.adding = False
+        user._state.db = 'default'
+        return user, AccessToken(claims)
+
+    def authenticate_write(self, claims):
+        user = get_user_model().objects.filter(
+            pk=claims['uid'], is_active=True).first()
+        if user is None or user.token_version != claims['ver']:
+            raise exceptions.AuthenticationFailed(_('Token has been revoked.'))
+
+        return user, AccessToken(claims)
+
+    def authenticate_header(self, request):
+        return self.keyword
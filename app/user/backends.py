@@ -0,0 +1,46 @@
+"""
+Authentication backends for the user API
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from rest_framework.request import Request
+
+from core import hashing
+
+
+class OffloadedHashingBackend(ModelBackend):
+    """ ModelBackend checking passwords in the hashing pool.
+
+    Only API requests use the pool; other logins, like the admin's, check
+    the password in the request thread. Hashes made with an outdated hasher
+    are replaced on successful login.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if not isinstance(request, Request):
+            return super().authenticate(
+                request, username=username, password=password, **kwargs)
+
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so the response time doesn't reveal unknown users.
+            hashing.make_password(password)
+            return None
+
+        valid, upgraded = hashing.verify_password(password, user.password)
+        if valid and upgraded:
+            user.password = upgraded
+            user.save(update_fields=['password'])
+
+        if valid and self.user_can_authenticate(user):
+            return user
+
+        return None
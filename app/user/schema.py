@@ -0,0 +1,16 @@
+"""
+OpenAPI descriptions of the user app's authentication.
+"""
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from drf_spectacular.plumbing import build_bearer_security_scheme_object
+
+
+class SignedAccessTokenScheme(OpenApiAuthenticationExtension):
+    target_class = 'user.authentication.SignedAccessTokenAuthentication'
+    name = 'accessTokenAuth'
+
+    def get_security_definition(self, auto_schema):
+        return build_bearer_security_scheme_object(
+            header_name='Authorization',
+            token_prefix=self.target.keyword,
+        )
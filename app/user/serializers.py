@@ -3,28 +3,49 @@ from django.contrib.auth import (
     get_user_model,
     authenticate,
 )
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from rest_framework import serializers
 
+from core import hashing, metrics
+from core.models import AuthToken
+
 
 class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = get_user_model()
         fields = ['email', 'password', 'name']
-        extra_kwargs = {'password': {'write_only': True, 'min_length': 5}}
+        extra_kwargs = {
+            'password': {'write_only': True, 'min_length': 5},
+            # Replaces the case-sensitive unique check, see validate_email.
+            'email': {'validators': []},
+        }
+
+    def validate_email(self, value):
+        users = get_user_model().objects.with_email(value)
+        if self.instance is not None:
+            users = users.exclude(pk=self.instance.pk)
+        if users.exists():
+            raise serializers.ValidationError(
+                _('A user with this email already exists.'), code='unique')
+
+        return value
 
     def create(self, validated_data):
         """ Create and return a user with encrypted password."""
-        return get_user_model().objects.create_user(**validated_data)
+        # Hashed in the pool, so a busy pool rejects the request with 429.
+        password_hash = hashing.make_password(validated_data.pop('password'))
+        return get_user_model().objects.create_user(
+            **validated_data, password_hash=password_hash)
 
     def update(self, instance, validated_data):
         password = validated_data.pop('password', None)
         user = super().update(instance, validated_data)
 
         if password:
-            user.set_password(password)
+            user.password = hashing.make_password(password)
             user.save()
 
         return user
@@ -46,8 +67,40 @@ class AuthTokenSerializer(serializers.Serializer):
             password=password,
         )
         if not user:
+            metrics.AUTH_FAILURES.labels(reason='invalid_credentials').inc()
             msg = _('Unable to authenticate with provided credentials.')
             raise serializers.ValidationError(msg, code='authorization')
 
         attrs['user'] = user
         return attrs
+
+
+class TokenSerializer(serializers.ModelSerializer):
+    token = serializers.CharField(source='key', read_only=True)
+
+    class Meta:
+        model = AuthToken
+        fields = ['token', 'expires']
+        read_only_fields = ['expires']
+
+
+class RefreshTokenSerializer(serializers.Serializer):
+    """ Exchange an API token for a signed access token. """
+    refresh = serializers.CharField(write_only=True)
+    access = serializers.CharField(read_only=True)
+    expires_in = serializers.IntegerField(read_only=True)
+
+    def validate_refresh(self, value):
+        token = AuthToken.objects.select_related('user').filter(
+            key=value).first()
+        if (
+            token is None
+            or token.expires <= timezone.now()
+            or token.is_revoked
+            or not token.user.is_active
+        ):
+            metrics.AUTH_FAILURES.labels(reason='invalid_refresh').inc()
+            msg = _('Invalid or expired refresh token.')
+            raise serializers.ValidationError(msg, code='authorization')
+
+        return token
@@ -0,0 +1,144 @@
+"""
+Tests for the offloaded password hashing
+"""
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import authenticate, get_user_model
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import hashing
+
+CREATE_USER_URL = reverse('user:create')
+TOKEN_URL = reverse('user:token')
+
+PBKDF2 = 'django.contrib.auth.hashers.PBKDF2PasswordHasher'
+ARGON2 = 'django.contrib.auth.hashers.Argon2PasswordHasher'
+
+
+# Settings overrides don't reach pool processes, so hash in the test thread
+# unless a test exercises the pool itself.
+@override_settings(PASSWORD_HASHING_WORKERS=0)
+class HashingTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.payload = {
+            'email': 'test@example.com',
+            'password': 'testpass123',
+        }
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    def test_login_through_pool(self):
+        """ Test creating a user and logging in with the process pool. """
+        res = self.client.post(
+            CREATE_USER_URL, {**self.payload, 'name': 'Test'})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('token', res.data)
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    @patch('core.hashing._get_executor')
+    @patch('core.hashing.multiprocessing.current_process')
+    def test_login_rejected_when_pool_full(
+            self, patched_current_process, patched_get_executor):
+        """ Test 429 with Retry-After when no hashing slot is free. """
+        patched_current_process.return_value.daemon = False
+        patched_get_executor.return_value = (
+            None, threading.BoundedSemaphore(0))
+
+        res = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(res['Retry-After'], '1')
+
+    def test_outdated_hash_upgraded_on_login(self):
+        """ Test a PBKDF2 hash is replaced by Argon2 on login. """
+        with self.settings(PASSWORD_HASHERS=[PBKDF2]):
+            user = get_user_model().objects.create_user(**self.payload)
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$'))
+
+        with self.settings(PASSWORD_HASHERS=[ARGON2, PBKDF2]):
+            res = self.client.post(TOKEN_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('argon2$'))
+
+    def test_invalid_password_not_upgraded(self):
+        with self.settings(PASSWORD_HASHERS=[PBKDF2]):
+            user = get_user_model().objects.create_user(**self.payload)
+
+        with self.settings(PASSWORD_HASHERS=[ARGON2, PBKDF2]):
+            valid, upgraded = hashing.verify_password('wrong', user.password)
+
+        self.assertFalse(valid)
+        self.assertIsNone(upgraded)
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    @patch('core.hashing._get_executor')
+    def test_set_password_outside_api_ignores_pool(self, patched_get_executor):
+        """ Test set_password hashes in the thread while the pool is full. """
+        patched_get_executor.return_value = (
+            None, threading.BoundedSemaphore(0))
+
+        user = get_user_model().objects.create_user(**self.payload)
+        user.set_password('newpass123')
+
+        self.assertTrue(user.check_password('newpass123'))
+        patched_get_executor.assert_not_called()
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    @patch('core.hashing._get_executor')
+    def test_non_api_login_ignores_pool(self, patched_get_executor):
+        """ Test logins outside the API, like the admin's, skip the pool. """
+        get_user_model().objects.create_user(**self.payload)
+        patched_get_executor.return_value = (
+            None, threading.BoundedSemaphore(0))
+
+        user = authenticate(
+            RequestFactory().post('/admin/login/'),
+            username=self.payload['email'],
+            password=self.payload['password'],
+        )
+
+        self.assertIsNotNone(user)
+        patched_get_executor.assert_not_called()
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    @patch('core.hashing._get_executor')
+    @patch('core.hashing.multiprocessing.current_process')
+    def test_daemonic_process_hashes_inline(
+            self, patched_current_process, patched_get_executor):
+        """ Test daemonic processes hash without starting a pool. """
+        patched_current_process.return_value.daemon = True
+
+        encoded = hashing.make_password('testpass123')
+
+        self.assertTrue(hashing.verify_password('testpass123', encoded)[0])
+        patched_get_executor.assert_not_called()
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    @patch('core.hashing._get_executor')
+    @patch('core.hashing.multiprocessing.current_process')
+    def test_broken_pool_replaced(
+            self, patched_current_process, patched_get_executor):
+        """ Test a broken pool is replaced and the call retried once. """
+        patched_current_process.return_value.daemon = False
+        broken = Mock()
+        broken.submit.side_effect = BrokenProcessPool()
+        working = Mock()
+        working.submit.return_value.result.return_value = 'hash'
+        slots = threading.BoundedSemaphore(1)
+        patched_get_executor.side_effect = [(broken, slots), (working, slots)]
+
+        self.assertEqual(hashing.make_password('testpass123'), 'hash')
+        self.assertEqual(patched_get_executor.call_count, 2)
@@ -0,0 +1,125 @@
+"""
+Tests for the login and sign-up throttles
+"""
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.test import APIClient
+
+CREATE_USER_URL = reverse('user:create')
+TOKEN_URL = reverse('user:token')
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={
+        **api_settings.user_settings,
+        'DEFAULT_THROTTLE_RATES': rates,
+    })
+
+
+class ThrottleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    @throttle_rates(login_ip='2/min')
+    def test_login_throttled_per_ip(self):
+        for i in range(2):
+            self.client.post(
+                TOKEN_URL, {'email': f'u{i}@example.com', 'password': 'bad'})
+
+        res = self.client.post(
+            TOKEN_URL, {'email': 'u3@example.com', 'password': 'bad'})
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', res)
+
+    @throttle_rates(login_email='2/min')
+    def test_login_throttled_per_email(self):
+        payload = {'email': 'test@example.com', 'password': 'bad'}
+        for i in range(2):
+            self.client.post(TOKEN_URL, payload)
+
+        res = self.client.post(
+            TOKEN_URL, {**payload, 'email': 'TEST@example.com'},
+            REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        res = self.client.post(
+            TOKEN_URL, {**payload, 'email': 'other@example.com'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @throttle_rates(login_ip='1/min')
+    @patch('core.hashing.make_password')
+    def test_throttled_login_skips_hashing(self, patched_make_password):
+        payload = {'email': 'test@example.com', 'password': 'bad'}
+        self.client.post(TOKEN_URL, payload)
+        patched_make_password.reset_mock()
+
+        res = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        patched_make_password.assert_not_called()
+
+    @throttle_rates(user_create_ip='1/hour')
+    def test_create_user_throttled_per_ip(self):
+        payload = {'password': 'testpass123', 'name': 'Test'}
+        self.client.post(
+            CREATE_USER_URL, {**payload, 'email': 'a@example.com'})
+
+        res = self.client.post(
+            CREATE_USER_URL, {**payload, 'email': 'b@example.com'})
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @throttle_rates(login_ip='2/min')
+    def test_previous_window_slides_out(self):
+        payload = {'email': 'test@example.com', 'password': 'bad'}
+        with patch('user.throttles.SlidingWindowThrottle.timer') as timer:
+            timer.return_value = 60
+            self.client.post(TOKEN_URL, payload)
+            self.client.post(TOKEN_URL, payload)
+
+            # Both requests are still inside the sliding window.
+            timer.return_value = 120
+            res = self.client.post(TOKEN_URL, payload)
+            self.assertEqual(
+                res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+            # A quarter of the previous window has slid out.
+            timer.return_value = 135
+            res = self.client.post(TOKEN_URL, payload)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+            timer.return_value = 136
+            res = self.client.post(TOKEN_URL, payload)
+            self.assertEqual(
+                res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @throttle_rates(login_ip='2/min')
+    def test_counter_created_concurrently(self):
+        """ Test a counter created by another request is incremented. """
+        payload = {'email': 'test@example.com', 'password': 'bad'}
+        with patch('user.throttles.SlidingWindowThrottle.timer') as timer, \
+                patch.object(cache, 'add', return_value=False) as add:
+            timer.return_value = 60
+            key = 'throttle:login_ip:127.0.0.1:1'
+            real_incr = cache.incr
+
+            def incr(key, delta=1):
+                # The other request's add lands between incr and add.
+                if not add.called:
+                    cache.set(key, 0, 120)
+                    raise ValueError
+                return real_incr(key, delta)
+
+            with patch.object(cache, 'incr', side_effect=incr):
+                self.client.post(TOKEN_URL, payload)
+
+            self.assertEqual(cache.get(key), 1)
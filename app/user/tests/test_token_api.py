@@ -0,0 +1,248 @@
+"""
+Tests for token expiry, renewal, rotation and signed access tokens
+"""
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.deletion import request_account_deletion
+from core.models import AuthToken
+from core.tests.helper import create_user
+from user.authentication import issue_access_token
+
+ME_URL = reverse('user:me')
+TOKEN_URL = reverse('user:token')
+ROTATE_URL = reverse('user:token-rotate')
+REFRESH_URL = reverse('user:token-refresh')
+REVOKE_URL = reverse('user:token-revoke')
+TAGS_URL = reverse('recipe:tag-list')
+RECIPES_URL = reverse('recipe:recipe-list')
+
+
+class TokenApiTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        self.token = AuthToken.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_valid_token_accepted(self):
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_expired_token_rejected_without_extra_query(self):
+        self.token.expires = timezone.now() - timedelta(seconds=1)
+        self.token.save()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(AUTH_TOKEN_TTL=3600, AUTH_TOKEN_RENEW_INTERVAL=60)
+    def test_token_renewed_after_interval(self):
+        old_expires = timezone.now() + timedelta(seconds=3600 - 120)
+        self.token.expires = old_expires
+        self.token.save()
+
+        self.client.get(ME_URL)
+
+        self.token.refresh_from_db()
+        self.assertGreater(self.token.expires, old_expires)
+
+    @override_settings(AUTH_TOKEN_TTL=3600, AUTH_TOKEN_RENEW_INTERVAL=60)
+    def test_token_not_renewed_within_interval(self):
+        expires = timezone.now() + timedelta(seconds=3600 - 10)
+        self.token.expires = expires
+        self.token.save()
+
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.expires, expires)
+
+    def test_rotate_token(self):
+        res = self.client.post(ROTATE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.data['token'], self.token.key)
+        self.assertFalse(AuthToken.objects.filter(pk=self.token.pk).exists())
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Token {AuthToken.objects.get().key}')
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    @override_settings(AUTH_TOKENS_PER_USER=2)
+    def test_login_keeps_newest_tokens(self):
+        """ Test logging in repeatedly doesn't pile up tokens. """
+        user = create_user(email='login@example.com', password='testpass123')
+        payload = {'email': user.email, 'password': 'testpass123'}
+
+        keys = [
+            self.client.post(TOKEN_URL, payload).data['token']
+            for _ in range(3)
+        ]
+
+        self.assertEqual(
+            set(user.auth_tokens.values_list('key', flat=True)),
+            set(keys[1:]),
+        )
+
+    def test_rotate_requires_token(self):
+        self.client.credentials()
+
+        res = self.client.post(ROTATE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(SIGNED_ACCESS_TOKENS=True, SIGNED_ACCESS_TOKEN_TTL=300)
+class SignedAccessTokenApiTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user()
+        self.token = AuthToken.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {issue_access_token(self.user)}')
+
+    def test_login_returns_access_token(self):
+        payload = {'email': 'test@example.com', 'password': 'testpass123'}
+
+        res = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('token', res.data)
+        self.assertIn('access', res.data)
+
+    @override_settings(SIGNED_ACCESS_TOKENS=False)
+    def test_login_without_access_token_when_disabled(self):
+        payload = {'email': 'test@example.com', 'password': 'testpass123'}
+
+        res = self.client.post(TOKEN_URL, payload)
+
+        self.assertNotIn('access', res.data)
+
+    def test_access_token_authenticates_without_query(self):
+        """ Test only the view's own query runs for an access token. """
+        with self.assertNumQueries(1):
+            res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_access_token_loads_user_for_me(self):
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    def test_access_token_creates_owned_objects(self):
+        res = self.client.post(TAGS_URL, {'name': 'Vegan'})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(self.user.tag_set.filter(name='Vegan').exists())
+
+    def test_expired_access_token_rejected(self):
+        with patch('django.core.signing.time.time',
+                   return_value=time.time() + 301):
+            res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tampered_access_token_rejected(self):
+        access = issue_access_token(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}x')
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(SIGNED_ACCESS_TOKENS=False)
+    def test_access_token_ignored_when_disabled(self):
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_issues_access_token(self):
+        res = self.client.post(REFRESH_URL, {'refresh': self.token.key})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['expires_in'], 300)
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {res.data["access"]}')
+        res = self.client.get(TAGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_refresh_with_expired_token_rejected(self):
+        self.token.expires = timezone.now() - timedelta(seconds=1)
+        self.token.save()
+
+        res = self.client.post(REFRESH_URL, {'refresh': self.token.key})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(SIGNED_ACCESS_TOKENS=False)
+    def test_refresh_unavailable_when_disabled(self):
+        res = self.client.post(REFRESH_URL, {'refresh': self.token.key})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_revoke_tokens(self):
+        """ Test revoked tokens are turned away on refresh and writes,
+        while issued access tokens can read until they expire. """
+        res = self.client.post(REVOKE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.token_version, 1)
+
+        res = self.client.post(REFRESH_URL, {'refresh': self.token.key})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(TAGS_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.post(TAGS_URL, {'name': 'Vegan'})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_access_token_of_deleted_account_cannot_write(self):
+        """ Test writes with the token of a deleted account get 401. """
+        self.user.delete()
+
+        res = self.client.post(RECIPES_URL, {
+            'title': 'Soup', 'time_minutes': 5})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_access_token_of_deactivated_account_cannot_write(self):
+        request_account_deletion(self.user)
+
+        res = self.client.post(TAGS_URL, {'name': 'Vegan'})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tokens_issued_after_revoke_accepted(self):
+        self.user.revoke_tokens()
+        token = AuthToken.objects.create(user=self.user)
+
+        res = self.client.post(REFRESH_URL, {'refresh': token.key})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
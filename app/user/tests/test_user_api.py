@@ -4,11 +4,15 @@ Tests for the User API
 
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from core.models import AuthToken
+from core.tests.query_budget import query_budget
+
 CREATE_USER_URL = reverse('user:create')
 TOKEN_URL = reverse('user:token')
 ME_URL = reverse('user:me')
@@ -18,9 +22,12 @@ def create_user(**params):
     return get_user_model().objects.create_user(**params)
 
 
+@query_budget
 class UnauthenticatedUserApiTests(TestCase):
 
     def setUp(self):
+        # Sign-ups are throttled per email.
+        cache.clear()
         self.client = APIClient()
 
     def test_create_user_success(self):
@@ -52,6 +59,19 @@ class UnauthenticatedUserApiTests(TestCase):
         )
         self.assertEqual(len(existing_users), 1)
 
+    def test_create_user_with_email_in_other_case_fails(self):
+        create_user(email='test@example.com', password='testpass123')
+        payload = {
+            "name": "Test User",
+            "email": "Test@Example.com",
+            "password": "testpass123"
+        }
+
+        res = self.client.post(CREATE_USER_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', res.data)
+
     def test_create_user_with_password_less_than_5_chars_fails(self):
         payload = {
             "name": "Test User",
@@ -104,6 +124,15 @@ class UnauthenticatedUserApiTests(TestCase):
         self.assertIn('token', res.data)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
+    def test_create_token_ignores_email_case(self):
+        create_user(email='Test@example.com', password='test123pass')
+
+        payload = {'email': 'test@EXAMPLE.com', 'password': 'test123pass'}
+        res = self.client.post(TOKEN_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('token', res.data)
+
     def test_create_token_with_bad_email_fails(self):
         user_details = {
             'name': 'Test Name',
@@ -148,6 +177,7 @@ class UnauthenticatedUserApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+@query_budget
 class AuthenticatedUserApiTests(TestCase):
 
     def setUp(self):
@@ -184,3 +214,31 @@ class AuthenticatedUserApiTests(TestCase):
         self.assertEqual(self.user.name, payload['name'])
         self.assertTrue(self.user.check_password(payload['password']))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_update_email_case(self):
+        res = self.client.patch(ME_URL, {'email': self.user.email.upper()})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_update_email_taken_in_other_case_fails(self):
+        create_user(email='other@example.com', password='testpass123')
+
+        res = self.client.patch(ME_URL, {'email': 'Other@example.com'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_delete_account_deactivates_user(self):
+        """ Test deleting the account locks it out before data is removed. """
+        AuthToken.objects.create(user=self.user)
+
+        res = self.client.delete(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertIsNotNone(self.user.deletion_requested)
+        self.assertFalse(AuthToken.objects.filter(user=self.user).exists())
+
+        payload = {'email': 'test@example.com', 'password': 'testpass123'}
+        res = APIClient().post(TOKEN_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
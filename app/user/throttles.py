@@ -0,0 +1,116 @@
+"""
+Throttles for the user API
+"""
+from django.core.cache import cache as default_cache
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """ Rate limit with a sliding-window counter in the shared cache.
+
+    Each key keeps one counter per fixed window. The rate over the last
+    duration is estimated from the current counter plus the share of the
+    previous one still inside the sliding window. The current counter is
+    incremented before it is compared, so concurrent requests can't all
+    pass on the same count. A check costs an incr and a get, plus an add
+    for the first request of a window and a decr for a rejected one.
+
+    The rate is read from DEFAULT_THROTTLE_RATES under
+    '<view.throttle_scope>_<scope_suffix>'.
+    """
+    cache = default_cache
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+    scope_suffix = None
+
+    def __init__(self):
+        # The scope depends on the view, so the rate is resolved later.
+        pass
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        self.scope = f'{view.throttle_scope}_{self.scope_suffix}'
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        current_key = f'{self.key}:{window}'
+        previous_key = f'{self.key}:{window - 1}'
+
+        # Requests in the current window before this one.
+        self.current = self.increment(current_key) - 1
+        self.previous = self.cache.get(previous_key, 0)
+        self.elapsed = (self.now % self.duration) / self.duration
+
+        if self.previous * (1 - self.elapsed) + self.current >= \
+                self.num_requests:
+            # Rejected requests don't count against the rate.
+            try:
+                self.cache.decr(current_key)
+            except ValueError:
+                pass
+            return self.throttle_failure()
+
+        return self.throttle_success()
+
+    def increment(self, key):
+        """ Increment the counter and return its new value. """
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            pass
+
+        # First request of the window. Windows are only read while
+        # current or previous.
+        if self.cache.add(key, 1, self.duration * 2):
+            return 1
+        # Another request created the counter in the meantime.
+        return self.cache.incr(key)
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        remaining = (1 - self.elapsed) * self.duration
+        if self.current >= self.num_requests or not self.previous:
+            return remaining
+
+        # Wait until enough of the previous window has slid out.
+        needed = 1 - (self.num_requests - self.current) / self.previous
+        return max((needed - self.elapsed) * self.duration, 0)
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """ Limit requests per client IP. """
+    scope_suffix = 'ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class EmailThrottle(SlidingWindowThrottle):
+    """ Limit requests per email address in the request body. """
+    scope_suffix = 'email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email')
+        if not isinstance(email, str) or not email:
+            return None
+
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': email.strip().lower(),
+        }
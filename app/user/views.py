@@ -1,29 +1,133 @@
 """
 Views for the user API
 """
-from rest_framework import generics, authentication, permissions
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
+from drf_spectacular.utils import extend_schema
+from rest_framework import generics, permissions, status
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
+from core.deletion import request_account_deletion
+from core.models import AuthToken
+from user.authentication import (
+    AccessToken,
+    ExpiringTokenAuthentication,
+    SignedAccessTokenAuthentication,
+    issue_access_token,
+)
 from user.serializers import (
     UserSerializer,
     AuthTokenSerializer,
+    RefreshTokenSerializer,
+    TokenSerializer,
 )
+from user.throttles import EmailThrottle, IPThrottle
 
 
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
+    throttle_classes = [IPThrottle, EmailThrottle]
+    throttle_scope = 'user_create'
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [
+        SignedAccessTokenAuthentication,
+        ExpiringTokenAuthentication,
+    ]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        user = self.request.user
+        if isinstance(self.request.auth, AccessToken) and \
+                self.request.method in permissions.SAFE_METHODS:
+            # On reads, access tokens only carry the primary key.
+            user.refresh_from_db()
+        return user
+
+    def destroy(self, request, *args, **kwargs):
+        """ Deactivate the account now and delete its data later. """
+        request_account_deletion(self.get_object())
+
+        return Response(status=status.HTTP_202_ACCEPTED)
 
 
 class CreateTokenView(ObtainAuthToken):
     serializer_class = AuthTokenSerializer
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    throttle_classes = [IPThrottle, EmailThrottle]
+    throttle_scope = 'login'
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data['user']
+        token = AuthToken.objects.create(user=user)
+
+        # Every login issues a token, so drop the oldest ones beyond the cap
+        # instead of letting repeated logins grow the table.
+        newest = AuthToken.objects.filter(user=user).order_by(
+            '-created').values('pk')[:settings.AUTH_TOKENS_PER_USER]
+        AuthToken.objects.filter(user=user).exclude(pk__in=newest).delete()
+
+        data = TokenSerializer(token).data
+        if settings.SIGNED_ACCESS_TOKENS:
+            data['access'] = issue_access_token(user)
+        return Response(data)
+
+
+class RotateTokenView(generics.GenericAPIView):
+    """ Replace the token used for the request with a new one. """
+    serializer_class = TokenSerializer
+    authentication_classes = [ExpiringTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        with transaction.atomic():
+            request.auth.delete()
+            token = AuthToken.objects.create(user=request.user)
+
+        return Response(self.get_serializer(token).data)
+
+
+class RefreshAccessTokenView(generics.GenericAPIView):
+    """ Issue a signed access token for an API token.
+
+    Only available when SIGNED_ACCESS_TOKENS is enabled. This is where
+    revoked and expired API tokens are turned away.
+    """
+    serializer_class = RefreshTokenSerializer
+    authentication_classes = []
+    permission_classes = []
+
+    def post(self, request, *args, **kwargs):
+        if not settings.SIGNED_ACCESS_TOKENS:
+            raise Http404
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data['refresh'].user
+
+        return Response({
+            'access': issue_access_token(user),
+            'expires_in': settings.SIGNED_ACCESS_TOKEN_TTL,
+        })
+
+
+class RevokeTokensView(generics.GenericAPIView):
+    """ Revoke every token issued to the user. """
+    authentication_classes = [
+        SignedAccessTokenAuthentication,
+        ExpiringTokenAuthentication,
+    ]
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(request=None, responses={204: None})
+    def post(self, request, *args, **kwargs):
+        request.user.revoke_tokens()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
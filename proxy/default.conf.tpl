@@ -1,13 +1,64 @@
+upstream app {
+    server ${APP_HOST}:${APP_PORT};
+    # Idle connections kept open to the app when it speaks HTTP. uWSGI
+    # closes its connection after every request.
+    keepalive 16;
+}
+
 server {
     listen ${LISTEN_PORT};
 
+    keepalive_timeout   65s;
+    keepalive_requests  1000;
+
+    gzip                on;
+    gzip_comp_level     ${GZIP_COMP_LEVEL};
+    gzip_min_length     ${GZIP_MIN_LENGTH};
+    gzip_proxied        any;
+    gzip_vary           on;
+    gzip_types          application/json application/javascript text/css
+                        image/svg+xml application/vnd.oai.openapi
+                        application/vnd.oai.openapi+json;
+
+    open_file_cache         max=1000 inactive=60s;
+    open_file_cache_valid   60s;
+    open_file_cache_errors  on;
+
+    # Large enough to hold a page of recipes without a temporary file.
+    uwsgi_buffer_size   16k;
+    uwsgi_buffers       16 16k;
+    proxy_buffer_size   16k;
+    proxy_buffers       16 16k;
+
     location /static {
-        alias /vol/static;
+        root /vol;
+        add_header Cache-Control "public, max-age=3600";
+
+        # Hashed names change with the content. The image build writes a
+        # gzipped copy next to each text file.
+        location ~ \.[0-9a-f]{12}\.\w+$ {
+            gzip_static on;
+            expires 1y;
+            add_header Cache-Control "public, immutable";
+        }
+    }
+
+    # Uploads are stored under random names that are never reused.
+    location /static/media {
+        root /vol;
+        add_header Cache-Control "public, max-age=31536000, immutable";
+    }
+
+    location /api/metrics {
+        allow           10.0.0.0/8;
+        allow           172.16.0.0/12;
+        allow           192.168.0.0/16;
+        deny            all;
+        include         /etc/nginx/app_pass.conf;
     }
 
     location / {
-        uwsgi_pass      ${APP_HOST}:${APP_PORT};
-        include         /etc/nginx/uwsgi_params;
+        include         /etc/nginx/app_pass.conf;
         client_max_body_size 10M;
     }
-}
\ No newline at end of file
+}
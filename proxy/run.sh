@@ -3,4 +3,14 @@
 set -e
 
 envsubst < /etc/nginx/default.conf.tpl > /etc/nginx/conf.d/default.conf
+
+# The app speaks the uwsgi protocol, or HTTP when it runs under ASGI.
+if [ "$APP_PROTOCOL" = "http" ]; then
+    echo "proxy_pass http://app;" > /etc/nginx/app_pass.conf
+    echo "include /etc/nginx/proxy_params;" >> /etc/nginx/app_pass.conf
+else
+    echo "uwsgi_pass app;" > /etc/nginx/app_pass.conf
+    echo "include /etc/nginx/uwsgi_params;" >> /etc/nginx/app_pass.conf
+fi
+
 nginx -g 'daemon off;'
\ No newline at end of file
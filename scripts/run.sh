@@ -2,8 +2,117 @@
 
 set -e
 
-python manage.py wait_for_db
-python manage.py collectstatic --noinput
-python manage.py migrate
+# Every uWSGI worker writes its metrics here; clear samples of old workers.
+# The image creates the default directory for django-user.
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+find "$PROMETHEUS_MULTIPROC_DIR" -mindepth 1 -delete
 
-uwsgi --socket :9000 --workers 4 --master --enable-threads --module app.wsgi
+STATIC_ROOT=${STATIC_ROOT:-/vol/web/static}
+# Set to 0 when migrations run as a separate job before the app starts.
+MIGRATE_ON_START=${MIGRATE_ON_START:-1}
+
+now() {
+    cut -d ' ' -f 1 /proc/uptime
+}
+
+# Run a startup phase and report how long it took.
+phase() {
+    name=$1
+    shift
+    start=$(now)
+    "$@"
+    echo "startup: $name took $(awk "BEGIN { print $(now) - $start }")s"
+}
+
+# Static files are collected when the image is built. Copy them to the
+# volume shared with the proxy once per image.
+sync_static() {
+    if ! cmp -s /static/.build-id "$STATIC_ROOT/.build-id"; then
+        cp -R /static/. "$STATIC_ROOT/"
+    fi
+}
+
+# Only run the full migrate when there are unapplied migrations.
+migrate() {
+    if ! python manage.py migrate --check > /dev/null; then
+        python manage.py migrate
+    fi
+}
+
+# Throttling and replica pinning need the shared cache to be up too.
+if [ "${CACHE_BACKEND:-locmem}" = "redis" ]; then
+    set -- --cache
+fi
+
+startup=$(now)
+phase wait_for_db \
+    python manage.py wait_for_db --timeout "${DB_WAIT_TIMEOUT:-60}" "$@"
+phase static sync_static
+if [ "$MIGRATE_ON_START" = "1" ]; then
+    phase migrate migrate
+fi
+echo "startup: ready to serve after $(awk "BEGIN { print $(now) - $startup }")s"
+
+# Worker model. WEB_WORKERS=auto sizes the pool from the available cores.
+WEB_WORKERS=${WEB_WORKERS:-4}
+if [ "$WEB_WORKERS" = "auto" ]; then
+    # Two workers per core, plus one for when others wait on the database.
+    WEB_WORKERS=$(( $(nproc) * 2 + 1 ))
+fi
+WEB_THREADS=${WEB_THREADS:-1}
+# Scale between WEB_MIN_WORKERS and WEB_WORKERS with load; 0 keeps all up.
+WEB_MIN_WORKERS=${WEB_MIN_WORKERS:-0}
+# Seconds before a stuck request's worker is killed; 0 disables.
+WEB_TIMEOUT=${WEB_TIMEOUT:-30}
+# Recycle a worker after this many requests or this much RSS; 0 disables.
+# Off by default: every recycled worker leaves its metrics files in
+# PROMETHEUS_MULTIPROC_DIR until the container restarts, and each scrape
+# reads all of them.
+WEB_MAX_REQUESTS=${WEB_MAX_REQUESTS:-0}
+WEB_MAX_RSS_MB=${WEB_MAX_RSS_MB:-0}
+# By default Django is loaded once in the master and workers fork from it,
+# sharing its memory copy-on-write. Set to 1 to load it in every worker.
+WEB_LAZY_APPS=${WEB_LAZY_APPS:-0}
+
+echo "Starting ${SERVER_MODE:-uwsgi} with $WEB_WORKERS workers," \
+    "$WEB_THREADS threads each"
+
+# SERVER_MODE=asgi serves HTTP from gunicorn with uvicorn workers; the
+# proxy must then run with APP_PROTOCOL=http.
+if [ "${SERVER_MODE:-uwsgi}" = "asgi" ]; then
+    export ASYNC_VIEWS=${ASYNC_VIEWS:-1}
+    exec gunicorn app.asgi:application \
+        --worker-class uvicorn.workers.UvicornWorker \
+        --workers "${ASGI_WORKERS:-$WEB_WORKERS}" \
+        --timeout "$WEB_TIMEOUT" \
+        --max-requests "$WEB_MAX_REQUESTS" \
+        --max-requests-jitter $(( WEB_MAX_REQUESTS / 10 )) \
+        --bind :9000 \
+        --forwarded-allow-ips '*'
+fi
+
+set -- \
+    --socket :9000 \
+    --module app.wsgi \
+    --master \
+    --die-on-term \
+    --enable-threads \
+    --workers "$WEB_WORKERS" \
+    --threads "$WEB_THREADS" \
+    --harakiri "$WEB_TIMEOUT" \
+    --max-requests "$WEB_MAX_REQUESTS"
+if [ "$WEB_LAZY_APPS" = "1" ]; then
+    set -- "$@" --lazy-apps
+fi
+if [ "$WEB_MIN_WORKERS" -gt 0 ] && [ "$WEB_MIN_WORKERS" -lt "$WEB_WORKERS" ]; then
+    set -- "$@" \
+        --cheaper "$WEB_MIN_WORKERS" \
+        --cheaper-initial "$WEB_MIN_WORKERS" \
+        --cheaper-step 1
+fi
+if [ "$WEB_MAX_RSS_MB" -gt 0 ]; then
+    set -- "$@" --reload-on-rss "$WEB_MAX_RSS_MB"
+fi
+
+exec uwsgi "$@"